@@ -1,15 +1,24 @@
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import FrozenSet, List
 
 class Settings(BaseSettings):
     # MongoDB Database
     mongodb_url: str = "mongodb://localhost:27017"
     mongodb_database: str = "pixelforge_db"
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 10  # keep warm connections ready
+    mongodb_max_connecting: int = 10  # connections opened in parallel during a burst (driver default: 2)
+    mongodb_max_idle_time_ms: int = 60000  # recycle idle connections after a minute
+    mongodb_wait_queue_timeout_ms: int = 2500  # fail fast when the pool is exhausted
+    mongodb_server_selection_timeout_ms: int = 3000  # fail fast when no server is reachable
     
     # JWT
     secret_key: str = "your-super-secret-jwt-key-change-this-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    token_cache_ttl: int = 5  # seconds a verified token/user pair is reused
+    token_cache_max_entries: int = 10000
     
     # SMTP
     smtp_server: str = "smtp.office365.com"
@@ -18,18 +27,51 @@ class Settings(BaseSettings):
     smtp_password: str = ""
     smtp_from_email: str = "support@pixelforgestudio.in"
     admin_email: str = "admin@pfs.in"
+    email_queue_workers: int = 2  # concurrent SMTP sends per process
+    email_queue_max_size: int = 1000
     
     # File Upload
     upload_dir: str = "uploads"
     max_file_size: int = 5242880  # 5MB
     allowed_image_extensions: str = "jpg,jpeg,png,gif,webp"
+    max_request_body_size: int = 27262976  # 26MB: five max-size images plus form fields
     
     # ImageKit Configuration
     imagekit_private_key: str = ""
     imagekit_public_key: str = ""
     imagekit_url_endpoint: str = ""
-    
+
+    # CORS (comma-separated origins; "*" allows any origin, including credentialed requests)
+    cors_origins: str = "*"
+
+    # Response compression
+    gzip_minimum_size: int = 1024  # bytes
+    gzip_compress_level: int = 5
+    brotli_quality: int = 4  # used when brotli-asgi is installed
+
+    # Redis Cache (caching is disabled when redis_url is empty)
+    redis_url: str = ""
+    cache_ttl: int = 3600  # 1 hour
+
     class Config:
         env_file = ".env"
 
-settings = Settings()
+    @cached_property
+    def allowed_image_extensions_set(self) -> FrozenSet[str]:
+        """Allowed extensions parsed once for O(1) membership checks."""
+        return frozenset(
+            ext.strip().lower() for ext in self.allowed_image_extensions.split(",") if ext.strip()
+        )
+
+    @cached_property
+    def cors_origins_list(self) -> List[str]:
+        """CORS origins parsed once from the comma-separated setting."""
+        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance."""
+    return Settings()
+
+# Kept for existing imports; prefer get_settings() in new code
+settings = get_settings()
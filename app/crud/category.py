@@ -1,28 +1,159 @@
-from typing import List, Optional
-from app.models import Category, Product
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from app.models import Category, Product, CASE_INSENSITIVE_COLLATION
 from app.schemas import CategoryCreate, CategoryUpdate
+from app.crud.utils import parse_object_id
+from app.services.cache import cache
+from beanie.odm.queries.update import UpdateResponse
+from beanie.operators import In
 from bson import ObjectId
 from datetime import datetime
 
+# How long other workers may serve a stale in-process category map
+CATEGORY_MAP_TTL = 30  # seconds
+
+# Shapes raw documents into API rows server-side; defaults mirror the Category model
+_CATEGORY_ROW_PROJECTION = {
+    "_id": 0,
+    "id": "$_id",
+    "name": 1,
+    "description": {"$ifNull": ["$description", None]},
+    "is_active": {"$ifNull": ["$is_active", True]},
+    "created_at": 1,
+    "updated_at": 1
+}
+
+def _parse_after_id(after_id: str) -> ObjectId:
+    """Parse a keyset pagination cursor, rejecting anything that is not an ObjectId."""
+    after_oid = parse_object_id(after_id)
+    if after_oid is None:
+        raise ValueError("Invalid after_id")
+    return after_oid
+
 class CategoryCRUD:
+    def __init__(self):
+        # In-process map of every category, used to validate product writes without a query
+        self._categories: Dict[ObjectId, Category] = {}
+        self._categories_loaded_at: Optional[float] = None
+        self._categories_lock = asyncio.Lock()
+    
+    async def _cached_lookup(self, key: str, loader: Callable[[], Awaitable[Optional[Category]]]) -> Optional[Category]:
+        """Cache-aside read: serve from Redis, otherwise load from MongoDB and repopulate."""
+        if not cache.enabled:
+            return await loader()
+        
+        cached = await cache.get(key)
+        if cached is not None:
+            return Category.model_validate_json(cached)
+        
+        # Stampede guard: only the lock holder repopulates the key
+        if not await cache.acquire_lock(key):
+            await asyncio.sleep(0.05)
+            cached = await cache.get(key)
+            if cached is not None:
+                return Category.model_validate_json(cached)
+            return await loader()
+        
+        try:
+            category = await loader()
+            if category:
+                await cache.set(key, category.model_dump_json())
+            return category
+        finally:
+            await cache.release_lock(key)
+    
+    async def _invalidate_cache(self, *categories: Category) -> None:
+        """Drop cached lookups for the given categories after a write."""
+        keys = []
+        for category in categories:
+            keys.append(f"category:id:{category.id}")
+            keys.append(f"category:name:{category.name.lower()}")
+        await cache.delete(*keys)
+        await cache.delete_pattern("cat:list:*")
+        # Product responses embed the category name
+        await cache.delete_pattern("prod:*")
+    
+    async def load_category_map(self) -> None:
+        """(Re)load the in-process category map from MongoDB."""
+        categories = await Category.find_all().to_list()
+        self._categories = {category.id: category for category in categories}
+        self._categories_loaded_at = time.monotonic()
+    
+    def _remember(self, category: Category) -> None:
+        """Apply a local write to the in-process map."""
+        self._categories[category.id] = category
+    
+    def _category_map_expired(self) -> bool:
+        """Whether the in-process map has never been loaded or is older than CATEGORY_MAP_TTL."""
+        return (self._categories_loaded_at is None
+                or time.monotonic() - self._categories_loaded_at > CATEGORY_MAP_TTL)
+    
+    async def _ensure_category_map(self) -> None:
+        """Reload the in-process map once it has expired (one reload per worker)."""
+        if self._category_map_expired():
+            async with self._categories_lock:
+                if self._category_map_expired():
+                    await self.load_category_map()
+    
+    async def get_cached_category(self, category_id: ObjectId) -> Optional[Category]:
+        """Return a category (active or not) from the in-process map.
+        
+        The map is refreshed on local writes and reloaded after CATEGORY_MAP_TTL
+        so changes made by other workers are picked up; unknown IDs fall back
+        to a single query in case the category was created elsewhere.
+        """
+        await self._ensure_category_map()
+        
+        category = self._categories.get(category_id)
+        if category is None:
+            category = await Category.get(category_id)
+            if category is None:
+                return None
+            self._remember(category)
+        return category
+    
+    async def get_cached_categories(self, category_ids: Iterable[ObjectId]) -> Dict[ObjectId, Category]:
+        """Resolve many categories from the in-process map, querying unknown IDs together."""
+        await self._ensure_category_map()
+        
+        found = {}
+        missing = []
+        for category_id in set(category_ids):
+            category = self._categories.get(category_id)
+            if category is None:
+                missing.append(category_id)
+            else:
+                found[category_id] = category
+        
+        if missing:
+            for category in await Category.find(In(Category.id, missing)).to_list():
+                self._remember(category)
+                found[category.id] = category
+        return found
+    
+    async def get_active_category(self, category_id: ObjectId) -> Optional[Category]:
+        """Return the category if it exists and is active, from the in-process map."""
+        category = await self.get_cached_category(category_id)
+        return category if category and category.is_active else None
+    
+    async def _has_products(self, category_id: ObjectId) -> bool:
+        """Check whether any product references the category, stopping at the first match."""
+        return await Product.find_one(Product.category_id.id == category_id) is not None
+    
     async def get_category_by_id(self, category_id: str) -> Optional[Category]:
         """Get category by ID."""
-        if not ObjectId.is_valid(category_id):
+        oid = parse_object_id(category_id)
+        if oid is None:
             return None
-        return await Category.get(ObjectId(category_id))
+        return await self._cached_lookup(f"category:id:{oid}", lambda: Category.get(oid))
     
     async def get_category_by_name(self, name: str) -> Optional[Category]:
-        """Get category by name."""
-        return await Category.find_one(Category.name == name)
-    
-    async def get_categories(self, skip: int = 0, limit: int = 100, active_only: bool = False) -> List[Category]:
-        """Get list of categories with optional pagination and active filter."""
-        if active_only:
-            query = Category.find(Category.is_active == True)
-        else:
-            query = Category.find_all()
-        
-        return await query.skip(skip).limit(limit).to_list()
+        """Get category by name (case-insensitive, served by the collated name index)."""
+        return await self._cached_lookup(
+            f"category:name:{name.lower()}",
+            lambda: Category.find_one(Category.name == name, collation=CASE_INSENSITIVE_COLLATION)
+        )
     
     async def get_categories_count(self, active_only: bool = False) -> int:
         """Get total count of categories."""
@@ -30,6 +161,39 @@ class CategoryCRUD:
             return await Category.find(Category.is_active == True).count()
         return await Category.count()
     
+    async def get_category_rows(self, skip: int = 0, limit: int = 100, active_only: bool = False, after_id: Optional[str] = None) -> List[dict]:
+        """Get a page of categories as plain response dicts, without building models.
+        
+        Rows come back in _id order; with after_id they start after that id (keyset
+        pagination), which stays an index range scan however deep the page is.
+        """
+        match = {"is_active": True} if active_only else {}
+        if after_id is not None:
+            match["_id"] = {"$gt": _parse_after_id(after_id)}
+        
+        # Always in _id order, so the last id of any page is a valid after_id cursor
+        pipeline = [{"$match": match}] if match else []
+        pipeline += [{"$sort": {"_id": 1}}, {"$skip": skip}, {"$limit": limit}, {"$project": _CATEGORY_ROW_PROJECTION}]
+        return await Category.get_motor_collection().aggregate(pipeline).to_list(length=None)
+    
+    async def stream_category_rows(self, active_only: bool = False, batch_size: int = 1000) -> AsyncIterator[dict]:
+        """Iterate over category rows in _id order, one cursor batch at a time."""
+        pipeline = [{"$match": {"is_active": True}}] if active_only else []
+        pipeline += [{"$sort": {"_id": 1}}, {"$project": _CATEGORY_ROW_PROJECTION}]
+        async for row in Category.get_motor_collection().aggregate(pipeline, batchSize=batch_size):
+            yield row
+    
+    async def get_categories_with_count(self, skip: int = 0, limit: int = 100, active_only: bool = False, after_id: Optional[str] = None) -> Tuple[List[dict], int]:
+        """Get a page of category rows and the total count in one concurrent round-trip."""
+        # Reject a bad cursor before the count starts rather than orphaning it
+        if after_id is not None:
+            _parse_after_id(after_id)
+        categories, total_count = await asyncio.gather(
+            self.get_category_rows(skip=skip, limit=limit, active_only=active_only, after_id=after_id),
+            self.get_categories_count(active_only=active_only)
+        )
+        return categories, total_count
+    
     async def create_category(self, category: CategoryCreate) -> Category:
         """Create a new category."""
         # Check if category name already exists
@@ -42,67 +206,79 @@ class CategoryCRUD:
             description=category.description,
             is_active=True
         )
-        return await db_category.insert()
+        db_category = await db_category.insert()
+        self._remember(db_category)
+        await self._invalidate_cache(db_category)
+        return db_category
     
     async def update_category(self, category_id: str, category_update: CategoryUpdate) -> Optional[Category]:
-        """Update an existing category."""
-        if not ObjectId.is_valid(category_id):
+        """Update an existing category with a targeted $set (never from a cached copy)."""
+        oid = parse_object_id(category_id)
+        if oid is None:
             return None
-        
-        db_category = await self.get_category_by_id(category_id)
-        if not db_category:
+        current = await Category.get(oid)
+        if not current:
             return None
         
         # Check if new name conflicts with existing category
-        if category_update.name and category_update.name != db_category.name:
+        if category_update.name and category_update.name != current.name:
             existing_category = await self.get_category_by_name(category_update.name)
-            if existing_category:
+            if existing_category and existing_category.id != oid:
                 raise ValueError(f"Category with name '{category_update.name}' already exists")
         
-        # Update fields
         update_data = category_update.dict(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow()
         
-        for field, value in update_data.items():
-            setattr(db_category, field, value)
+        db_category = await Category.find_one(Category.id == oid).update(
+            {"$set": update_data}, response_type=UpdateResponse.NEW_DOCUMENT
+        )
+        if not db_category:
+            return None
         
-        return await db_category.save()
+        self._remember(db_category)
+        await self._invalidate_cache(db_category)
+        if current.name != db_category.name:
+            await cache.delete(f"category:name:{current.name.lower()}")
+        return db_category
     
     async def delete_category(self, category_id: str) -> bool:
         """Delete a category (soft delete by setting is_active=False)."""
-        if not ObjectId.is_valid(category_id):
-            return False
-        
-        db_category = await self.get_category_by_id(category_id)
-        if not db_category:
+        oid = parse_object_id(category_id)
+        if oid is None:
             return False
         
         # Check if category has associated products
-        product_count = await Product.find(Product.category_id == db_category).count()
-        if product_count > 0:
-            raise ValueError(f"Cannot delete category. It has {product_count} associated products.")
+        if await self._has_products(oid):
+            raise ValueError("Cannot delete category. It has associated products.")
         
         # Soft delete
-        db_category.is_active = False
-        db_category.updated_at = datetime.utcnow()
-        await db_category.save()
+        db_category = await Category.find_one(Category.id == oid).update(
+            {"$set": {"is_active": False, "updated_at": datetime.utcnow()}},
+            response_type=UpdateResponse.NEW_DOCUMENT
+        )
+        if not db_category:
+            return False
+        
+        self._remember(db_category)
+        await self._invalidate_cache(db_category)
         return True
     
     async def hard_delete_category(self, category_id: str) -> bool:
         """Permanently delete a category (use with caution)."""
-        if not ObjectId.is_valid(category_id):
+        oid = parse_object_id(category_id)
+        if oid is None:
             return False
-        
-        db_category = await self.get_category_by_id(category_id)
+        db_category = await Category.get(oid)
         if not db_category:
             return False
         
         # Check if category has associated products
-        product_count = await Product.find(Product.category_id == db_category).count()
-        if product_count > 0:
-            raise ValueError(f"Cannot delete category. It has {product_count} associated products.")
+        if await self._has_products(oid):
+            raise ValueError("Cannot delete category. It has associated products.")
         
         await db_category.delete()
+        self._categories.pop(db_category.id, None)
+        await self._invalidate_cache(db_category)
         return True
 
 # Create global instance
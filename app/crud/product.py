@@ -1,81 +1,189 @@
-from typing import List, Optional
+import asyncio
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from app.models import Product, Category
+from app.crud.category import category_crud
+from app.crud.utils import is_object_id, parse_object_id
 from app.schemas import ProductCreate, ProductUpdate
+from app.services.cache import cache
 from app.services.upload import upload_service
-from bson import ObjectId
+from beanie import Link
+from beanie.odm.queries.update import UpdateResponse
+from beanie.operators import In
+from bson import DBRef, ObjectId
 from datetime import datetime
 
+# Upper bound on documents accepted by a single bulk insert
+MAX_BULK_PRODUCTS = 10_000
+
+# Cache prefixes of the product detail and listing responses (see app/routers/products.py)
+PRODUCT_DETAIL_CACHE_PREFIX = "prod:detail"
+PRODUCT_LIST_CACHE_PREFIX = "prod:list"
+
+# Newest first; _id breaks ties between products created in the same millisecond
+# (bulk inserts) so skip/limit pages never overlap. Served by ix_products_created_at_id.
+_NEWEST_FIRST = {"created_at": -1, "_id": -1}
+
+# Constant stages of the listing aggregation, built once instead of per request: join
+# the category and project each product straight into its response row. ObjectId and
+# DBRef values are left for MongoJSONResponse to encode.
+_PRODUCT_ROW_STAGES = (
+    {"$lookup": {
+        "from": Category.Settings.name,
+        "localField": "category_id.$id",
+        "foreignField": "_id",
+        "as": "_category"
+    }},
+    {"$project": {
+        "_id": 0,
+        "id": "$_id",
+        "title": "$title",
+        "description": {"$ifNull": ["$description", None]},
+        "short_description": {"$ifNull": ["$short_description", None]},
+        "price": "$price",
+        "category_id": {"$ifNull": ["$category_id", None]},
+        "category_name": {"$ifNull": [{"$arrayElemAt": ["$_category.name", 0]}, None]},
+        "rating": {"$ifNull": ["$rating", 0.0]},
+        "images": {"$ifNull": ["$images", []]},
+        "is_locked": {"$ifNull": ["$is_locked", False]},
+        "created_at": "$created_at",
+        "updated_at": "$updated_at"
+    }}
+)
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most size items."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
 class ProductCRUD:
-    async def get_product_by_id(self, product_id: str) -> Optional[Product]:
-        """Get product by ID with category information."""
-        if not ObjectId.is_valid(product_id):
+    async def _invalidate_cache(self, *product_ids: str) -> None:
+        """Drop cached product responses after a write; every listing may be affected."""
+        if product_ids:
+            await cache.delete(*(f"{PRODUCT_DETAIL_CACHE_PREFIX}:{pid}" for pid in product_ids))
+        await cache.delete_pattern(f"{PRODUCT_LIST_CACHE_PREFIX}:*")
+    
+    async def get_product_by_id(self, product_id: str, fetch_links: bool = True) -> Optional[Product]:
+        """Get product by ID, optionally resolving its category link.
+        
+        The link is resolved from the in-process category map, so the lookup
+        stays a plain _id find_one instead of a $lookup aggregation.
+        """
+        oid = parse_object_id(product_id)
+        if oid is None:
             return None
-        return await Product.get(ObjectId(product_id), fetch_links=True)
+        product = await Product.get(oid)
+        if product and fetch_links:
+            await self._attach_categories([product])
+        return product
+    
+    async def _attach_categories(self, products: List[Product]) -> List[Product]:
+        """Resolve the category links of products from the in-process category map."""
+        for product in products:
+            if isinstance(product.category_id, Link):
+                category = await category_crud.get_cached_category(product.category_id.ref.id)
+                if category:
+                    product.category_id = category
+        return products
     
-    async def get_products(
+    async def list_with_category(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[str] = None,
+        unlocked_only: bool = False
+    ) -> Tuple[List[dict], int]:
+        """Get a page of product response rows, newest first, plus the total count.
+        
+        The page aggregation and count_documents run concurrently; counting
+        separately lets the server count from the index instead of pushing
+        every matched document through the pipeline.
+        """
+        match = {}
+        if unlocked_only:
+            match["is_locked"] = False
+        category_oid = parse_object_id(category_id)
+        if category_oid:
+            match["category_id.$id"] = category_oid
+        
+        collection = Product.get_motor_collection()
+        pipeline = [
+            {"$match": match},
+            {"$sort": _NEWEST_FIRST},
+            {"$skip": skip},
+            {"$limit": limit},
+            *_PRODUCT_ROW_STAGES
+        ]
+        rows, total = await asyncio.gather(
+            collection.aggregate(pipeline).to_list(length=limit),
+            collection.count_documents(match)
+        )
+        
+        # Any category the $lookup could not resolve falls back to the category map
+        unresolved = [
+            row for row in rows
+            if row["category_name"] is None and isinstance(row["category_id"], DBRef)
+        ]
+        if unresolved:
+            categories = await category_crud.get_cached_categories(row["category_id"].id for row in unresolved)
+            for row in unresolved:
+                category = categories.get(row["category_id"].id)
+                if category:
+                    row["category_name"] = category.name
+        
+        return rows, total
+    
+    async def stream_products(
+        self, 
+        category_id: Optional[str] = None, 
+        unlocked_only: bool = False, 
+        batch_size: int = 1000
+    ) -> AsyncIterator[dict]:
+        """Iterate over matching products as raw documents, newest first, one cursor batch at a time.
+        
+        Used by exports so memory stays constant regardless of catalog size.
+        """
+        query = {}
+        if unlocked_only:
+            query["is_locked"] = False
+        category_oid = parse_object_id(category_id)
+        if category_oid:
+            query["category_id.$id"] = category_oid
+        
+        cursor = Product.get_motor_collection().find(query).sort(list(_NEWEST_FIRST.items())).batch_size(batch_size)
+        async for doc in cursor:
+            yield doc
+    
+    async def get_products_page(
         self, 
         skip: int = 0, 
         limit: int = 100, 
         category_id: Optional[str] = None
-    ) -> List[Product]:
-        """Get all products with pagination and optional category filter."""
-        if category_id and ObjectId.is_valid(category_id):
-            category = await Category.get(ObjectId(category_id))
-            if not category:
-                return []
-            return await Product.find(Product.category_id == category).skip(skip).limit(limit).to_list()
-        else:
-            return await Product.find().skip(skip).limit(limit).to_list()
+    ) -> Tuple[List[dict], int]:
+        """Get a page of product rows together with the total count."""
+        return await self.list_with_category(skip=skip, limit=limit, category_id=category_id)
     
-    async def get_products_count(self, category_id: Optional[str] = None) -> int:
-        """Get total count of products."""
-        if category_id and ObjectId.is_valid(category_id):
-            category = await Category.get(ObjectId(category_id))
-            if not category:
-                return 0
-            return await Product.find(Product.category_id == category).count()
-        
-        return await Product.find().count()
-    
-    async def get_unlocked_products(
+    async def get_unlocked_products_page(
         self, 
         skip: int = 0, 
         limit: int = 100, 
         category_id: Optional[str] = None
-    ) -> List[Product]:
-        """Get only unlocked products with pagination and optional category filter."""
-        if category_id and ObjectId.is_valid(category_id):
-            category = await Category.get(ObjectId(category_id))
-            if not category:
-                return []
-            return await Product.find(
-                Product.is_locked == False, 
-                Product.category_id == category
-            ).skip(skip).limit(limit).to_list()
-        else:
-            return await Product.find(Product.is_locked == False).skip(skip).limit(limit).to_list()
-    
-    async def get_unlocked_products_count(self, category_id: Optional[str] = None) -> int:
-        """Get total count of unlocked products."""
-        if category_id and ObjectId.is_valid(category_id):
-            category = await Category.get(ObjectId(category_id))
-            if not category:
-                return 0
-            return await Product.find(
-                Product.is_locked == False, 
-                Product.category_id == category
-            ).count()
-        
-        return await Product.find(Product.is_locked == False).count()
+    ) -> Tuple[List[dict], int]:
+        """Get a page of unlocked product rows together with the total count."""
+        return await self.list_with_category(
+            skip=skip, limit=limit, category_id=category_id, unlocked_only=True
+        )
     
     async def create_product(self, product: ProductCreate) -> Product:
         """Create new product."""
         # Validate that category exists and is active
-        if not ObjectId.is_valid(product.category_id):
+        category_oid = parse_object_id(product.category_id)
+        if category_oid is None:
             raise ValueError(f"Invalid category ID: {product.category_id}")
         
-        category = await Category.get(ObjectId(product.category_id))
-        if not category or not category.is_active:
+        category = await category_crud.get_active_category(category_oid)
+        if not category:
             raise ValueError(f"Category with ID {product.category_id} not found or inactive")
         
         db_product = Product(
@@ -88,50 +196,143 @@ class ProductCRUD:
             images=product.images or [],
             is_locked=False
         )
-        return await db_product.insert()
+        await db_product.insert()
+        await self._invalidate_cache()
+        return db_product
     
-    async def update_product(self, product_id: str, product_update: ProductUpdate) -> Optional[Product]:
-        """Update product information."""
-        if not ObjectId.is_valid(product_id):
-            return None
+    async def _resolve_active_categories(self, category_ids: Set[str]) -> Dict[str, Category]:
+        """Map category ID strings to active categories, raising ValueError on any bad ID."""
+        invalid_ids = {cid for cid in category_ids if not is_object_id(cid)}
+        if invalid_ids:
+            raise ValueError(f"Invalid category ID(s): {', '.join(sorted(invalid_ids))}")
         
-        db_product = await self.get_product_by_id(product_id)
-        if not db_product:
+        categories = await category_crud.get_cached_categories(ObjectId(cid) for cid in category_ids)
+        categories_by_id = {
+            str(oid): category for oid, category in categories.items() if category.is_active
+        }
+        
+        missing_ids = category_ids - categories_by_id.keys()
+        if missing_ids:
+            raise ValueError(f"Categories not found or inactive: {', '.join(sorted(missing_ids))}")
+        return categories_by_id
+    
+    async def create_products_bulk(self, products: List[ProductCreate]) -> List[Product]:
+        """Create many products with a single insert_many."""
+        if not products:
+            return []
+        if len(products) > MAX_BULK_PRODUCTS:
+            raise ValueError(f"Cannot create more than {MAX_BULK_PRODUCTS} products at once")
+        
+        categories_by_id = await self._resolve_active_categories(
+            {product.category_id for product in products}
+        )
+        
+        db_products = [
+            Product(
+                title=product.title,
+                description=product.description,
+                short_description=product.short_description,
+                price=product.price,
+                category_id=categories_by_id[product.category_id],
+                rating=product.rating,
+                images=product.images or [],
+                is_locked=False
+            )
+            for product in products
+        ]
+        result = await Product.insert_many(db_products)
+        for db_product, inserted_id in zip(db_products, result.inserted_ids):
+            db_product.id = inserted_id
+        await self._invalidate_cache()
+        return db_products
+    
+    async def create_products_stream(
+        self, 
+        rows: Iterable[ProductCreate], 
+        batch_size: int = 1000
+    ) -> int:
+        """Ingest a large catalog in batches of raw insert_many calls.
+        
+        Unlike create_products_bulk this never holds the whole import in memory
+        and skips building Product documents; categories are checked once per
+        batch against the in-process category map. Returns the number of
+        inserted products.
+        """
+        collection = Product.get_motor_collection()
+        category_collection = Category.get_collection_name()
+        inserted = 0
+        
+        for batch in _chunked(rows, batch_size):
+            await self._resolve_active_categories({product.category_id for product in batch})
+            
+            now = datetime.utcnow()
+            documents = [
+                {
+                    "title": product.title,
+                    "description": product.description,
+                    "short_description": product.short_description,
+                    "price": product.price,
+                    "category_id": DBRef(category_collection, ObjectId(product.category_id)),
+                    "rating": product.rating,
+                    "images": product.images or [],
+                    "is_locked": False,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for product in batch
+            ]
+            result = await collection.insert_many(documents, ordered=False)
+            inserted += len(result.inserted_ids)
+        
+        await self._invalidate_cache()
+        return inserted
+    
+    async def update_product(self, product_id: str, product_update: ProductUpdate) -> Optional[Product]:
+        """Update product information with a single findOneAndUpdate."""
+        oid = parse_object_id(product_id)
+        if oid is None:
             return None
         
-        # Check if product is locked
-        if db_product.is_locked:
-            raise ValueError("Cannot update locked product")
+        update_data = product_update.dict(exclude_unset=True)
         
-        # Validate category if being updated
+        # Validate category if being updated, reusing the fetched document for the response
+        category = None
         if product_update.category_id:
-            if not ObjectId.is_valid(product_update.category_id):
+            category_oid = parse_object_id(product_update.category_id)
+            if category_oid is None:
                 raise ValueError(f"Invalid category ID: {product_update.category_id}")
             
-            category = await Category.get(ObjectId(product_update.category_id))
-            if not category or not category.is_active:
+            category = await category_crud.get_active_category(category_oid)
+            if not category:
                 raise ValueError(f"Category with ID {product_update.category_id} not found or inactive")
-        
-        update_data = product_update.dict(exclude_unset=True)
-        
-        # Handle category_id update
-        if "category_id" in update_data:
-            category = await Category.get(ObjectId(update_data["category_id"]))
-            update_data["category_id"] = category
+            update_data["category_id"] = DBRef(Category.get_collection_name(), category.id)
+        else:
+            update_data.pop("category_id", None)
         
         update_data["updated_at"] = datetime.utcnow()
         
-        for field, value in update_data.items():
-            setattr(db_product, field, value)
+        # Only unlocked products match, so the lock check and the write are one round-trip
+        db_product = await Product.find_one(
+            Product.id == oid,
+            Product.is_locked == False
+        ).update({"$set": update_data}, response_type=UpdateResponse.NEW_DOCUMENT)
         
-        return await db_product.save()
+        if not db_product:
+            # Distinguish a missing product from a locked one (rare path)
+            if await Product.find_one(Product.id == oid).count():
+                raise ValueError("Cannot update locked product")
+            return None
+        
+        await self._invalidate_cache(product_id)
+        if category:
+            db_product.category_id = category
+        else:
+            await self._attach_categories([db_product])
+        return db_product
     
     async def delete_product(self, product_id: str) -> bool:
         """Delete product."""
-        if not ObjectId.is_valid(product_id):
-            return False
-        
-        db_product = await self.get_product_by_id(product_id)
+        db_product = await self.get_product_by_id(product_id, fetch_links=False)
         if not db_product:
             return False
         
@@ -139,37 +340,55 @@ class ProductCRUD:
         if db_product.is_locked:
             raise ValueError("Cannot delete locked product")
         
-        # Delete associated images
+        # Delete associated images (blocking ImageKit/filesystem calls run off the event loop)
         if db_product.images:
-            upload_service.delete_product_images(db_product.images)
+            await asyncio.to_thread(upload_service.delete_product_images, db_product.images)
         
         await db_product.delete()
+        await self._invalidate_cache(product_id)
         return True
     
-    async def lock_product(self, product_id: str) -> Optional[Product]:
-        """Lock a product to prevent modifications."""
-        if not ObjectId.is_valid(product_id):
+    async def _set_lock(self, product_id: str, is_locked: bool) -> Optional[Product]:
+        """Set the lock state and return the updated product in one findOneAndUpdate."""
+        oid = parse_object_id(product_id)
+        if oid is None:
             return None
         
-        db_product = await self.get_product_by_id(product_id)
-        if not db_product:
-            return None
-        
-        db_product.is_locked = True
-        db_product.updated_at = datetime.utcnow()
-        return await db_product.save()
+        db_product = await Product.find_one(Product.id == oid).update(
+            {"$set": {"is_locked": is_locked, "updated_at": datetime.utcnow()}},
+            response_type=UpdateResponse.NEW_DOCUMENT
+        )
+        if db_product:
+            await self._invalidate_cache(product_id)
+            await self._attach_categories([db_product])
+        return db_product
+    
+    async def lock_product(self, product_id: str) -> Optional[Product]:
+        """Lock a product to prevent modifications."""
+        return await self._set_lock(product_id, True)
     
     async def unlock_product(self, product_id: str) -> Optional[Product]:
         """Unlock a product to allow modifications."""
-        if not ObjectId.is_valid(product_id):
-            return None
-        
-        db_product = await self.get_product_by_id(product_id)
-        if not db_product:
-            return None
+        return await self._set_lock(product_id, False)
+    
+    async def _set_lock_bulk(self, product_ids: List[str], is_locked: bool) -> int:
+        """Set the lock state of many products with a single updateMany."""
+        invalid_ids = [pid for pid in product_ids if not is_object_id(pid)]
+        if invalid_ids:
+            raise ValueError(f"Invalid product ID(s): {', '.join(invalid_ids)}")
         
-        db_product.is_locked = False
-        db_product.updated_at = datetime.utcnow()
-        return await db_product.save()
+        result = await Product.find(
+            In(Product.id, [ObjectId(pid) for pid in product_ids])
+        ).update({"$set": {"is_locked": is_locked, "updated_at": datetime.utcnow()}})
+        await self._invalidate_cache(*product_ids)
+        return result.matched_count
+    
+    async def lock_products_bulk(self, product_ids: List[str]) -> int:
+        """Lock many products at once. Returns the number of matched products."""
+        return await self._set_lock_bulk(product_ids, True)
+    
+    async def unlock_products_bulk(self, product_ids: List[str]) -> int:
+        """Unlock many products at once. Returns the number of matched products."""
+        return await self._set_lock_bulk(product_ids, False)
 
 product_crud = ProductCRUD()
@@ -1,28 +1,46 @@
+import logging
 from typing import List, Optional
-from app.models import User, UserRole
+from app.crud.utils import parse_object_id
+from app.models import User, UserRole, UserSummary
 from app.schemas import UserCreate, UserUpdate
-from app.services.auth import get_password_hash, verify_password
-from bson import ObjectId
+from app.services.auth import get_password_hash, verify_and_update_password
+from app.services.token_cache import token_cache
+from beanie.odm.queries.update import UpdateResponse
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Fixed projection for the per-request auth lookup, built once instead of per query
+_USER_SUMMARY_PROJECTION = {"email": 1, "role": 1, "created_at": 1, "updated_at": 1}
+
 class UserCRUD:
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
-        if not ObjectId.is_valid(user_id):
+        oid = parse_object_id(user_id)
+        if oid is None:
             return None
-        return await User.get(ObjectId(user_id))
+        return await User.get(oid)
     
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         return await User.find_one(User.email == email)
     
-    async def get_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        """Get all users with pagination."""
-        return await User.find_all().skip(skip).limit(limit).to_list()
+    async def get_user_summary_by_email(self, email: str) -> Optional[UserSummary]:
+        """Get the projected identity used by authentication (no password hash).
+        
+        This runs on every authenticated cache miss, so it goes straight to the
+        collection with a prebuilt filter shape and projection.
+        """
+        doc = await User.get_motor_collection().find_one({"email": email}, _USER_SUMMARY_PROJECTION)
+        return UserSummary.model_validate(doc) if doc else None
+    
+    async def get_users(self, skip: int = 0, limit: int = 100) -> List[UserSummary]:
+        """Get all users with pagination, projected to the fields list views need."""
+        return await User.find_all().project(UserSummary).skip(skip).limit(limit).to_list()
     
     async def get_users_count(self) -> int:
-        """Get total count of users."""
-        return await User.count()
+        """Get total count of users from collection metadata (no filter, so no scan needed)."""
+        return await User.get_motor_collection().estimated_document_count()
     
     async def create_user(self, user: UserCreate) -> User:
         """Create new user."""
@@ -30,17 +48,14 @@ class UserCRUD:
         db_user = User(
             email=user.email,
             hashed_password=hashed_password,
-            role="USER"
+            role=UserRole.USER.value
         )
         return await db_user.insert()
     
     async def update_user(self, user_id: str, user_update: UserUpdate) -> Optional[User]:
-        """Update user information."""
-        if not ObjectId.is_valid(user_id):
-            return None
-        
-        db_user = await self.get_user_by_id(user_id)
-        if not db_user:
+        """Update user information with a single findOneAndUpdate."""
+        oid = parse_object_id(user_id)
+        if oid is None:
             return None
         
         update_data = user_update.dict(exclude_unset=True)
@@ -49,35 +64,40 @@ class UserCRUD:
         
         update_data["updated_at"] = datetime.utcnow()
         
-        for field, value in update_data.items():
-            setattr(db_user, field, value)
-        
-        return await db_user.save()
+        db_user = await User.find_one(User.id == oid).update(
+            {"$set": update_data},
+            response_type=UpdateResponse.NEW_DOCUMENT
+        )
+        if db_user:
+            # Cached users keyed by token would otherwise keep the old role for a few seconds
+            token_cache.clear()
+        return db_user
     
     async def delete_user(self, user_id: str) -> bool:
         """Delete user."""
-        if not ObjectId.is_valid(user_id):
+        oid = parse_object_id(user_id)
+        if oid is None:
             return False
         
-        db_user = await self.get_user_by_id(user_id)
-        if not db_user:
+        result = await User.find_one(User.id == oid).delete()
+        if not result or not result.deleted_count:
             return False
         
-        await db_user.delete()
+        token_cache.clear()
         return True
     
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password."""
-        print(f"Authenticating user: {email}, {password}")
+        logger.debug("auth attempt email=%s", email)
         user = await self.get_user_by_email(email)
         if not user:
-            print("User not found.")
             return None
-        print(f"User found: {user.email}")
-        if not verify_password(password, user.hashed_password):
-            print("Password verification failed.")
+        is_valid, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not is_valid:
             return None
-        print("Authentication successful.")
+        if new_hash:
+            # Transparently upgrade legacy bcrypt hashes to Argon2id
+            await user.set({User.hashed_password: new_hash})
         return user
 
 user_crud = UserCRUD()
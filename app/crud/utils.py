@@ -0,0 +1,16 @@
+import re
+from typing import Optional
+from bson import ObjectId
+
+# Cheaper than ObjectId.is_valid, which constructs an ObjectId and catches the error
+_match_object_id = re.compile(r"^[0-9a-fA-F]{24}\Z").match
+
+def is_object_id(value: Optional[str]) -> bool:
+    """Check whether value is a 24-character hex ObjectId string."""
+    return isinstance(value, str) and _match_object_id(value) is not None
+
+def parse_object_id(value: Optional[str]) -> Optional[ObjectId]:
+    """Parse value into an ObjectId, or return None if it is not a valid ID."""
+    if not is_object_id(value):
+        return None
+    return ObjectId(value)
@@ -12,7 +12,15 @@ db = Database()
 
 async def connect_to_mongo():
     """Create database connection"""
-    db.client = AsyncIOMotorClient(settings.mongodb_url)
+    db.client = AsyncIOMotorClient(
+        settings.mongodb_url,
+        maxPoolSize=settings.mongodb_max_pool_size,
+        minPoolSize=settings.mongodb_min_pool_size,
+        maxConnecting=settings.mongodb_max_connecting,
+        maxIdleTimeMS=settings.mongodb_max_idle_time_ms,
+        waitQueueTimeoutMS=settings.mongodb_wait_queue_timeout_ms,
+        serverSelectionTimeoutMS=settings.mongodb_server_selection_timeout_ms
+    )
     db.database = db.client[settings.mongodb_database]
 
 async def close_mongo_connection():
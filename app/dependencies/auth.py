@@ -1,26 +1,40 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.services.auth import verify_token
+from app.services.auth import decode_access_token
+from app.services.token_cache import token_cache
 from app.crud.user import user_crud
-from app.models import User
+from app.models import UserRole, UserSummary
 
 security = HTTPBearer()
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
+) -> UserSummary:
     """Get current authenticated user."""
+    # Resolve the user at most once per request, however many guards chain
+    state_user = getattr(request.state, "user", None)
+    if state_user is not None:
+        return state_user
+    
     token = credentials.credentials
-    email = verify_token(token)
     
-    if email is None:
+    # Repeated requests with the same token skip verification and the user lookup
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        request.state.user = cached_user
+        return cached_user
+    
+    payload = decode_access_token(token)
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = await user_crud.get_user_by_email(email=email)
+    # Only the identity fields are loaded; the password hash never leaves the database
+    user = await user_crud.get_user_summary_by_email(email=payload["sub"])
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -28,19 +42,21 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    token_cache.set(token, user, payload.get("exp", 0))
+    request.state.user = user
     return user
 
-async def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin_user(current_user: UserSummary = Depends(get_current_user)) -> UserSummary:
     """Get current user and verify admin role."""
-    # Handle both "Admin" and "ADMIN" for backward compatibility
-    if current_user.role.lower() not in ["admin"]:
+    # Roles are normalized to UserRole values when the user is loaded
+    if current_user.role != UserRole.ADMIN.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions. Admin access required."
         )
     return current_user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: UserSummary = Depends(get_current_user)) -> UserSummary:
     """Get current active user (placeholder for future user status)."""
     # In the future, you might add an 'is_active' field to User model
     return current_user
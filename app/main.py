@@ -1,17 +1,61 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Request, status
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from pydantic import ValidationError
+import asyncio
 import os
 import logging
-from app.database import connect_to_mongo, close_mongo_connection, init_db
+import time
+from app.database import db, connect_to_mongo, close_mongo_connection, init_db
 from app.routers import auth, users, products, inquiry, categories
 from app.config import settings
+from app.crud.category import category_crud
+from app.services.cache import cache
+from app.services.email_queue import email_queue
+from app.services.upload import upload_service
+
+# Brotli compression (optional dependency; gzip is used when it is not installed)
+try:
+    from brotli_asgi import BrotliMiddleware
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound on the MongoDB ping made by /health
+HEALTH_CHECK_TIMEOUT = 2.0  # seconds
+
+class BodySizeLimitMiddleware:
+    """Reject requests whose declared Content-Length exceeds a limit.
+    
+    Runs before FastAPI parses (and spools to disk) a multipart body, so an
+    oversized product upload is refused without reading it.
+    """
+    
+    def __init__(self, app, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_body_size:
+                        response = ORJSONResponse(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            content={"detail": f"Request body exceeds {self.max_body_size} bytes"}
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
@@ -26,17 +70,25 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized with Beanie")
     
-    # Create upload directories
-    os.makedirs(settings.upload_dir, exist_ok=True)
+    # Warm the in-process category map used to validate product writes
+    await category_crud.load_category_map()
+    
+    # Create upload directories (makedirs creates the parent too)
     os.makedirs(os.path.join(settings.upload_dir, "products"), exist_ok=True)
     logger.info("Upload directories created")
     
+    # Start the workers that send queued emails
+    await email_queue.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down PixelForge Backend...")
+    await email_queue.stop()
     await close_mongo_connection()
     logger.info("MongoDB connection closed")
+    await cache.close()
+    upload_service.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -50,13 +102,36 @@ app = FastAPI(
     license_info={
         "name": "MIT",
     },
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson encodes responses several times faster than the stdlib json module
+    default_response_class=ORJSONResponse
 )
 
+# Compress larger JSON responses (product, category and user listings)
+if BROTLI_AVAILABLE:
+    # Brotli for clients that accept "br", gzip for the rest
+    app.add_middleware(
+        BrotliMiddleware,
+        quality=settings.brotli_quality,
+        minimum_size=settings.gzip_minimum_size,
+        gzip_fallback=True
+    )
+else:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.gzip_minimum_size,
+        compresslevel=settings.gzip_compress_level
+    )
+
+# Refuse oversized uploads from their headers (added before CORS so 413s still carry CORS headers)
+app.add_middleware(BodySizeLimitMiddleware, max_body_size=settings.max_request_body_size)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
+    allow_origins=settings.cors_origins_list,
+    # With the default "*", credentialed requests are answered with the caller's
+    # origin echoed back, i.e. any site may send them; list origins in production
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -86,29 +161,45 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "upload_service": "active"
-    }
+    """Health check endpoint; pings MongoDB so readiness probes reflect real connectivity."""
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(db.database.command("ping"), timeout=HEALTH_CHECK_TIMEOUT)
+        database_status = "connected"
+    except Exception as e:
+        logger.warning(f"Health check ping failed: {str(e)}")
+        database_status = "unreachable"
+    latency_ms = round((time.perf_counter() - started) * 1000, 2)
+    
+    healthy = database_status == "connected"
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "healthy" if healthy else "unhealthy",
+            "database": database_status,
+            "database_latency_ms": latency_ms,
+            "upload_service": "active"
+        }
+    )
+
+# Domain validation errors raised by CRUD/services map to 400 without per-endpoint try/except
+@app.exception_handler(ValueError)
+async def value_error_handler(request: Request, exc: ValueError):
+    """Return a 400 for ValueErrors that reach the app."""
+    # pydantic's ValidationError subclasses ValueError but signals a server-side bug here
+    if isinstance(exc, ValidationError):
+        return await global_exception_handler(request, exc)
+    return ORJSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": str(exc)}
+    )
 
 # Global exception handler
 @app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
+async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unhandled exceptions."""
-    logger.error(f"Unhandled exception: {str(exc)}")
-    return HTTPException(
-        status_code=500,
-        detail="Internal server error occurred"
-    )
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        reload_dirs=["app"]
+    logger.exception(f"Unhandled exception on {request.method} {request.url.path}: {str(exc)}")
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "Internal server error occurred"}
     )
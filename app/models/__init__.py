@@ -1,26 +1,59 @@
-from beanie import Document, Indexed, Link
-from pydantic import Field, EmailStr
+from beanie import Document, Indexed, Link, PydanticObjectId
+from pydantic import BaseModel, Field, EmailStr, validator
 from typing import Optional, List
 from datetime import datetime
 import enum
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.collation import Collation
+
+# Case-insensitive comparison used by the category name index and lookups
+CASE_INSENSITIVE_COLLATION = Collation(locale="en", strength=2)
 
 class UserRole(str, enum.Enum):
     ADMIN = "ADMIN"
     USER = "USER"
 
+def normalize_role(value) -> str:
+    """Return the canonical UserRole value for a role, accepting any casing."""
+    role = value.value if isinstance(value, UserRole) else str(value).upper()
+    if role not in UserRole.__members__:
+        raise ValueError(f'Invalid role: {value}')
+    return role
+
 class User(Document):
     email: Indexed(EmailStr, unique=True)
     hashed_password: str
-    role: str = Field(default="USER")
+    role: str = Field(default=UserRole.USER.value)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    @validator('role')
+    def validate_role(cls, v):
+        """Store roles as canonical UserRole values so checks are plain equality."""
+        return normalize_role(v)
+
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel([("role", ASCENDING)], name="ix_users_role"),
+        ]
+
+class UserSummary(BaseModel):
+    """Projection of User for list views and auth; never loads hashed_password."""
+    id: PydanticObjectId = Field(alias="_id")
+    email: str
+    role: str
+    created_at: datetime
+    updated_at: datetime
+
+    @validator('role')
+    def validate_role(cls, v):
+        """Normalize legacy role casing, as on User."""
+        return normalize_role(v)
 
 class Category(Document):
-    name: Indexed(str, unique=True)
+    name: str
     description: Optional[str] = None
     is_active: bool = Field(default=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -28,6 +61,19 @@ class Category(Document):
 
     class Settings:
         name = "categories"
+        indexes = [
+            IndexModel(
+                [("name", ASCENDING)],
+                name="ux_categories_name_ci",
+                unique=True,
+                collation=CASE_INSENSITIVE_COLLATION
+            ),
+            # Active filter plus _id keyset pagination as an index range scan
+            IndexModel(
+                [("is_active", ASCENDING), ("_id", ASCENDING)],
+                name="ix_categories_is_active_id"
+            ),
+        ]
 
 class Product(Document):
     title: Indexed(str)
@@ -43,3 +89,22 @@ class Product(Document):
 
     class Settings:
         name = "products"
+        indexes = [
+            # Category-filtered listings (with or without is_locked) and the category
+            # in-use check
+            IndexModel(
+                [("category_id.$id", ASCENDING), ("is_locked", ASCENDING)],
+                name="ix_products_category_is_locked"
+            ),
+            # The public unlocked listing without a category: matches and counts
+            # is_locked=false from the index and reads pages in newest-first order
+            IndexModel(
+                [("is_locked", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="ix_products_is_locked_created_at"
+            ),
+            # Newest-first listings and exports; _id matches their tie-break sort key
+            IndexModel(
+                [("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="ix_products_created_at_id"
+            ),
+        ]
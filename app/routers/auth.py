@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from app.schemas import UserCreate, User, Token, LoginRequest, APIResponse
@@ -10,7 +10,7 @@ from app.config import settings
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 @router.post("/register", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(user: UserCreate):
+async def register_user(user: UserCreate, background_tasks: BackgroundTasks):
     """Register a new user."""
     # Check if user already exists
     existing_user = await user_crud.get_user_by_email(email=user.email)
@@ -24,11 +24,8 @@ async def register_user(user: UserCreate):
     try:
         db_user = await user_crud.create_user(user)
         
-        # Send welcome email (async, don't block on failure)
-        try:
-            email_service.send_welcome_email(db_user.email)
-        except Exception as e:
-            print(f"Warning: Failed to send welcome email: {e}")
+        # Send welcome email after the response; the blocking SMTP call runs in the threadpool
+        background_tasks.add_task(email_service.send_welcome_email, db_user.email)
         
         # Create access token
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, status, BackgroundTasks
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
+import zlib
 from datetime import datetime
 from app.schemas import InquiryRequest, APIResponse
 from app.services.email import email_service
+from app.services.email_queue import email_queue
 
 router = APIRouter(
     prefix="/inquiry",
     tags=["Inquiry"],
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -32,46 +36,46 @@ async def submit_inquiry(inquiry: InquiryRequest, background_tasks: BackgroundTa
     - **message**: Inquiry message (required, min 10 characters)
     - **subscribe_newsletter**: Whether to subscribe to newsletter (optional)
     """
-    try:
-        # Log the inquiry
-        logger.info(f"New inquiry received from {inquiry.email} - Subject: {inquiry.subject}")
-        
-        # Prepare inquiry data for email
-        inquiry_data = {
-            "first_name": inquiry.first_name,
-            "last_name": inquiry.last_name,
-            "email": inquiry.email,
-            "phone_number": inquiry.phone_number,
-            "subject": inquiry.subject,
-            "message": inquiry.message,
-            "subscribe_newsletter": inquiry.subscribe_newsletter,
-            "submitted_at": datetime.now().isoformat()
-        }
-        
-        # Send emails in the background to avoid blocking the response
+    # Log the inquiry
+    logger.info(f"New inquiry received from {inquiry.email} - Subject: {inquiry.subject}")
+    
+    # Read the clock once and reuse it for every timestamp below
+    now = datetime.now()
+    submitted_at = now.isoformat()
+    
+    # Prepare inquiry data for email
+    inquiry_data = {
+        "first_name": inquiry.first_name,
+        "last_name": inquiry.last_name,
+        "email": inquiry.email,
+        "phone_number": inquiry.phone_number,
+        "subject": inquiry.subject,
+        "message": inquiry.message,
+        "subscribe_newsletter": inquiry.subscribe_newsletter,
+        "submitted_at": submitted_at
+    }
+    
+    # Hand the emails to the queue workers; fall back to a background task if the queue is unavailable
+    if not email_queue.enqueue(email_service.send_inquiry_notification, inquiry_data):
         background_tasks.add_task(email_service.send_inquiry_notification, inquiry_data)
-        
-        # Generate a reference number for the inquiry
-        reference_id = f"INQ-{datetime.now().strftime('%Y%m%d')}-{hash(inquiry.email) % 10000:04d}"
-        
-        logger.info(f"Inquiry {reference_id} processed successfully")
-        
-        return APIResponse(
-            success=True,
-            message="Thank you for your inquiry! We have received your message and will get back to you soon.",
-            data={
-                "reference_id": reference_id,
-                "submitted_at": datetime.now().isoformat(),
-                "status": "received"
-            }
-        )
-        
-    except Exception as e:
-        logger.error(f"Error processing inquiry: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Unable to process your inquiry at the moment. Please try again later."
-        )
+    
+    # Generate a reference number for the inquiry (crc32 is cheap and, unlike
+    # the salted builtin hash(), stable across processes)
+    reference_id = f"INQ-{now.strftime('%Y%m%d')}-{zlib.crc32(inquiry.email.encode()) % 10000:04d}"
+    
+    logger.info(f"Inquiry {reference_id} processed successfully")
+    
+    # Returned directly to skip response_model validation (kept for OpenAPI),
+    # so the 201 has to be set here as well
+    return ORJSONResponse({
+        "success": True,
+        "message": "Thank you for your inquiry! We have received your message and will get back to you soon.",
+        "data": {
+            "reference_id": reference_id,
+            "submitted_at": submitted_at,
+            "status": "received"
+        }
+    }, status_code=status.HTTP_201_CREATED)
 
 @router.get("/contact/test", tags=["Inquiry"])
 async def test_email_service():
@@ -79,41 +83,35 @@ async def test_email_service():
     Test endpoint to verify email service configuration.
     This endpoint is for testing purposes only.
     """
-    try:
-        # Test email data
-        test_inquiry = {
-            "first_name": "Test",
-            "last_name": "User",
-            "email": "test@example.com",
-            "phone_number": "+1234567890",
-            "subject": "Test Inquiry",
-            "message": "This is a test inquiry to verify the email service is working properly.",
-            "subscribe_newsletter": False,
-            "submitted_at": datetime.now().isoformat()
-        }
-        
-        # Try to send test emails
-        email_sent = email_service.send_inquiry_notification(test_inquiry)
-        
-        if email_sent:
-            return APIResponse(
-                success=True,
-                message="Email service is working correctly!",
-                data={"test_completed": True, "timestamp": datetime.now().isoformat()}
-            )
-        else:
-            return APIResponse(
-                success=False,
-                message="Email service test failed. Please check email configuration.",
-                data={"test_completed": False, "timestamp": datetime.now().isoformat()}
-            )
-            
-    except Exception as e:
-        logger.error(f"Email service test failed: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Email service test failed: {str(e)}"
-        )
+    timestamp = datetime.now().isoformat()
+    
+    # Test email data
+    test_inquiry = {
+        "first_name": "Test",
+        "last_name": "User",
+        "email": "test@example.com",
+        "phone_number": "+1234567890",
+        "subject": "Test Inquiry",
+        "message": "This is a test inquiry to verify the email service is working properly.",
+        "subscribe_newsletter": False,
+        "submitted_at": timestamp
+    }
+    
+    # SMTP is blocking; run it on a worker thread so the event loop stays free
+    email_sent = await asyncio.to_thread(email_service.send_inquiry_notification, test_inquiry)
+    
+    if email_sent:
+        return ORJSONResponse({
+            "success": True,
+            "message": "Email service is working correctly!",
+            "data": {"test_completed": True, "timestamp": timestamp}
+        })
+    else:
+        return ORJSONResponse({
+            "success": False,
+            "message": "Email service test failed. Please check email configuration.",
+            "data": {"test_completed": False, "timestamp": timestamp}
+        })
 
 # @router.get("/subjects", tags=["Inquiry"])
 # async def get_inquiry_subjects():
@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Awaitable, List, Optional, Tuple
+from beanie import Link
+from pydantic import ValidationError
+import asyncio
 import time
+import orjson
 from app.schemas import (
-    ProductCreate, ProductUpdate, Product, ProductResponse,
-    ProductListResponse, APIResponse
+    ProductCreate, ProductUpdate, Product,
+    ProductListResponse, ProductBulkIds, APIResponse
 )
-from app.crud.product import product_crud
+from app.crud.product import product_crud, PRODUCT_DETAIL_CACHE_PREFIX, PRODUCT_LIST_CACHE_PREFIX
 from app.crud.category import category_crud
+from app.crud.utils import parse_object_id
 from app.dependencies.auth import get_current_user, get_current_admin_user
 from app.services.upload import upload_service
 from app.services.email import email_service
-from app.models import User as UserModel, Product as ProductModel
+from app.services.cache import cached
+from app.services.serialization import MongoJSONResponse
+from app.models import UserSummary, Category as CategoryModel, Product as ProductModel
 from app.config import settings
 
 # Import ImageKit service for authentication
@@ -20,30 +28,97 @@ try:
 except ImportError:
     IMAGEKIT_AVAILABLE = False
 
-router = APIRouter(prefix="/products", tags=["Products"])
+router = APIRouter(prefix="/products", tags=["Products"], default_response_class=MongoJSONResponse)
 
-async def product_to_response(product: ProductModel) -> ProductResponse:
-    """Convert Product model to ProductResponse with category name."""
-    # Fetch category name if needed
-    category_name = None
-    if product.category_id:
-        await product.fetch_link(ProductModel.category_id)
-        category_name = product.category_id.name if product.category_id else None
+async def _get_category(category_id: str) -> Optional[CategoryModel]:
+    """Look up a category in the in-process category map (no query for known IDs)."""
+    oid = parse_object_id(category_id)
+    return await category_crud.get_cached_category(oid) if oid else None
+
+async def _require_active_category(category_id: str) -> None:
+    """Reject a listing filter that names a missing or inactive category."""
+    category = await _get_category(category_id)
+    if not category or not category.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Category with ID {category_id} not found or inactive"
+        )
+
+async def _fetch_listing_page(
+    page: Awaitable[Tuple[List[dict], int]],
+    category_id: Optional[str]
+) -> Tuple[List[dict], int]:
+    """Await a listing page, validating its category filter concurrently.
     
-    return ProductResponse(
-        id=str(product.id),
-        title=product.title,
-        description=product.description,
-        short_description=product.short_description,
-        price=product.price,
-        category_id=str(product.category_id.id) if product.category_id else None,
-        category_name=category_name,
-        rating=product.rating,
-        images=product.images,
-        is_locked=product.is_locked,
-        created_at=product.created_at,
-        updated_at=product.updated_at
-    )
+    The page is cancelled if the category is rejected, so a bad filter does not
+    leave an unfiltered page and count running in the background.
+    """
+    if not category_id:
+        return await page
+    page_task = asyncio.ensure_future(page)
+    try:
+        await _require_active_category(category_id)
+    except BaseException:
+        page_task.cancel()
+        raise
+    return await page_task
+
+def _product_cache_key(func, product_id: str) -> str:
+    """Key detail responses by product ID so writes can invalidate them individually."""
+    return product_id
+
+def _listing_response(rows: List[dict], total: int, message: str) -> MongoJSONResponse:
+    """Render a listing page from the rows projected by product_crud (no model round-trip)."""
+    return MongoJSONResponse({
+        "success": True,
+        "message": message,
+        "data": rows,
+        "total": total
+    })
+
+def _product_row(product: ProductModel) -> dict:
+    """Response fields for a product whose category has already been attached."""
+    category = product.category_id
+    return {
+        "id": str(product.id),
+        "title": product.title,
+        "description": product.description,
+        "short_description": product.short_description,
+        "price": product.price,
+        "category_id": str(category.id) if category else None,
+        "category_name": getattr(category, "name", None),
+        "rating": product.rating,
+        "images": product.images,
+        "is_locked": product.is_locked,
+        "created_at": product.created_at,
+        "updated_at": product.updated_at
+    }
+
+async def _ensure_category(product: ProductModel) -> ProductModel:
+    """Fetch the category only when product_crud left it as an unresolved Link."""
+    if isinstance(product.category_id, Link):
+        await product.fetch_link(ProductModel.category_id)
+    return product
+
+async def _product_response(product: ProductModel, message: str, status_code: int = status.HTTP_200_OK) -> MongoJSONResponse:
+    """Render a single-product response straight from its row (no model round-trip)."""
+    return MongoJSONResponse({
+        "success": True,
+        "message": message,
+        "data": _product_row(await _ensure_category(product))
+    }, status_code=status_code)
+
+# Fields returned by the lock/unlock endpoints
+_LOCK_RESPONSE_FIELDS = ("id", "title", "category_id", "category_name", "is_locked")
+
+def _lock_response(product: ProductModel, message: str) -> MongoJSONResponse:
+    """Build the lock/unlock response for a product whose category is attached."""
+    row = _product_row(product)
+    return MongoJSONResponse({
+        "success": True,
+        "message": message,
+        "data": {field: row[field] for field in _LOCK_RESPONSE_FIELDS}
+    })
 
 @router.post("/", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
 async def create_product(
@@ -54,167 +129,174 @@ async def create_product(
     category_id: str = Form(...),
     rating: float = Form(0.0, ge=0.0, le=5.0),
     images: List[UploadFile] = File(default=[], description="Upload product images (max 5 files)"),
-    current_user: UserModel = Depends(get_current_admin_user)
+    current_user: UserSummary = Depends(get_current_admin_user)
 ):
     """Create a new product (Admin only)."""
-    try:
-        # Validate category exists and is active before creating product
-        category = await category_crud.get_category_by_id(category_id)
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Category with ID {category_id} not found"
-            )
-        if not category.is_active:
+    # Validate category exists and is active before creating product
+    category = await _get_category(category_id)
+    if not category:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Category with ID {category_id} not found"
+        )
+    if not category.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Category '{category.name}' is currently inactive"
+        )
+    
+    # Handle image uploads
+    image_paths = []
+    if images and len(images) > 0:
+        # Filter out empty files (files with no filename)
+        valid_images = [img for img in images if img.filename and img.filename.strip()]
+        
+        if len(valid_images) > 5:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Category '{category.name}' is currently inactive"
+                detail="Maximum 5 images allowed per product"
             )
         
-        # Handle image uploads
-        image_paths = []
-        if images and len(images) > 0:
-            # Filter out empty files (files with no filename)
-            valid_images = [img for img in images if img.filename and img.filename.strip()]
-            
-            if len(valid_images) > 5:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Maximum 5 images allowed per product"
-                )
-            
-            if valid_images:
-                image_paths = await upload_service.upload_product_images(valid_images)
-        
-        # Create product data with validation
-        try:
-            product_data = ProductCreate(
-                title=title,
-                description=description,
-                short_description=short_description,
-                price=price,
-                category_id=category_id,
-                rating=rating,
-                images=image_paths
-            )
-        except Exception as validation_error:
-            from pydantic import ValidationError
-            if isinstance(validation_error, ValidationError):
-                error_messages = []
-                for error in validation_error.errors():
-                    field = error["loc"][-1] if error["loc"] else "unknown"
-                    message = error["msg"]
-                    error_messages.append(f"{field}: {message}")
-                detail = "Validation failed: " + "; ".join(error_messages)
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
-            else:
-                raise
-        
-        db_product = await product_crud.create_product(product_data)
-        
-        # Convert to response format with category name
-        product_data = await product_to_response(db_product)
-        
-        return APIResponse(
-            success=True,
-            message="Product created successfully",
-            data=product_data.dict()
-        )
-    except HTTPException:
-        # Re-raise HTTPException as-is
-        raise
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        # Import ValidationError for better error handling
-        from pydantic import ValidationError
-        if isinstance(e, ValidationError):
-            error_messages = []
-            for error in e.errors():
-                field = " -> ".join(str(loc) for loc in error["loc"])
-                message = error["msg"]
-                error_messages.append(f"{field}: {message}")
-            detail = "Validation errors: " + "; ".join(error_messages)
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
-        else:
-            detail = f"Failed to create product: {str(e)}"
-        
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=detail
+        if valid_images:
+            image_paths = await upload_service.upload_product_images(valid_images)
+    
+    # Create product data with validation
+    try:
+        product_data = ProductCreate(
+            title=title,
+            description=description,
+            short_description=short_description,
+            price=price,
+            category_id=category_id,
+            rating=rating,
+            images=image_paths
         )
+    except ValidationError as validation_error:
+        error_messages = []
+        for error in validation_error.errors():
+            field = error["loc"][-1] if error["loc"] else "unknown"
+            message = error["msg"]
+            error_messages.append(f"{field}: {message}")
+        detail = "Validation failed: " + "; ".join(error_messages)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+    
+    db_product = await product_crud.create_product(product_data)
+    
+    return await _product_response(db_product, "Product created successfully", status.HTTP_201_CREATED)
+
+@router.post("/bulk", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
+async def create_products_bulk(
+    products: List[ProductCreate],
+    current_user: UserSummary = Depends(get_current_admin_user)
+):
+    """Create many products in a single batch (Admin only)."""
+    db_products = await product_crud.create_products_bulk(products)
+    
+    return APIResponse(
+        success=True,
+        message=f"Created {len(db_products)} products successfully",
+        data={
+            "created": len(db_products),
+            "ids": [str(product.id) for product in db_products]
+        }
+    )
+
+@router.patch("/bulk/lock", response_model=APIResponse)
+async def lock_products_bulk(
+    payload: ProductBulkIds,
+    current_user: UserSummary = Depends(get_current_admin_user)
+):
+    """Lock many products in a single update (Admin only)."""
+    matched = await product_crud.lock_products_bulk(payload.ids)
+    
+    return APIResponse(
+        success=True,
+        message=f"Locked {matched} products successfully",
+        data={"matched": matched, "is_locked": True}
+    )
+
+@router.patch("/bulk/unlock", response_model=APIResponse)
+async def unlock_products_bulk(
+    payload: ProductBulkIds,
+    current_user: UserSummary = Depends(get_current_admin_user)
+):
+    """Unlock many products in a single update (Admin only)."""
+    matched = await product_crud.unlock_products_bulk(payload.ids)
+    
+    return APIResponse(
+        success=True,
+        message=f"Unlocked {matched} products successfully",
+        data={"matched": matched, "is_locked": False}
+    )
+
+@router.get("/export")
+async def export_products(
+    category_id: Optional[str] = Query(None),
+    unlocked_only: bool = Query(False),
+    current_user: UserSummary = Depends(get_current_admin_user)
+):
+    """Stream all products as newline-delimited JSON (Admin only)."""
+    async def ndjson() -> AsyncIterator[bytes]:
+        async for doc in product_crud.stream_products(
+            category_id=category_id, unlocked_only=unlocked_only
+        ):
+            category_ref = doc.get("category_id")
+            yield orjson.dumps({
+                "id": str(doc["_id"]),
+                "title": doc["title"],
+                "description": doc.get("description"),
+                "short_description": doc.get("short_description"),
+                "price": doc["price"],
+                "category_id": str(category_ref.id) if category_ref else None,
+                "rating": doc.get("rating", 0.0),
+                "images": doc.get("images", []),
+                "is_locked": doc.get("is_locked", False),
+                "created_at": doc.get("created_at"),
+                "updated_at": doc.get("updated_at")
+            }) + b"\n"
+    
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="products.ndjson"'}
+    )
 
 @router.get("/unlocked", response_model=ProductListResponse)
+@cached(prefix=PRODUCT_LIST_CACHE_PREFIX, expire=60)
 async def list_unlocked_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     category_id: Optional[str] = Query(None)
 ):
     """List only unlocked products with optional category filter."""
-    try:
-        # Validate category if provided
-        if category_id:
-            category = await category_crud.get_category_by_id(category_id)
-            if not category or not category.is_active:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Category with ID {category_id} not found or inactive"
-                )
-        
-        products = await product_crud.get_unlocked_products(skip=skip, limit=limit, category_id=category_id)
-        total_count = await product_crud.get_unlocked_products_count(category_id=category_id)
-        
-        # Convert products to response format with category names
-        products_data = [await product_to_response(product) for product in products]
-        
-        return ProductListResponse(
-            success=True,
-            message=f"Retrieved {len(products)} unlocked products successfully",
-            data=products_data,
-            total=total_count
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve unlocked products: {str(e)}"
-        )
+    # The category filter is validated while the page is fetched
+    rows, total_count = await _fetch_listing_page(
+        product_crud.get_unlocked_products_page(skip=skip, limit=limit, category_id=category_id),
+        category_id
+    )
+    
+    # Rows arrive already shaped like ProductResponse, category names included
+    return _listing_response(rows, total_count, f"Retrieved {len(rows)} unlocked products successfully")
 
 @router.get("/", response_model=ProductListResponse)
+@cached(prefix=PRODUCT_LIST_CACHE_PREFIX, expire=60)
 async def list_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     category_id: Optional[str] = Query(None)
 ):
     """List all products with optional category filter."""
-    try:
-        # Validate category if provided
-        if category_id:
-            category = await category_crud.get_category_by_id(category_id)
-            if not category or not category.is_active:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Category with ID {category_id} not found or inactive"
-                )
-        
-        products = await product_crud.get_products(skip=skip, limit=limit, category_id=category_id)
-        total_count = await product_crud.get_products_count(category_id=category_id)
-        
-        # Convert products to response format with category names
-        products_data = [await product_to_response(product) for product in products]
-        
-        return ProductListResponse(
-            success=True,
-            message=f"Retrieved {len(products)} products successfully",
-            data=products_data,
-            total=total_count
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve products: {str(e)}"
-        )
+    # The category filter is validated while the page is fetched
+    rows, total_count = await _fetch_listing_page(
+        product_crud.get_products_page(skip=skip, limit=limit, category_id=category_id),
+        category_id
+    )
+    
+    # Rows arrive already shaped like ProductResponse, category names included
+    return _listing_response(rows, total_count, f"Retrieved {len(rows)} products successfully")
 
 @router.get("/{product_id}", response_model=APIResponse)
+@cached(prefix=PRODUCT_DETAIL_CACHE_PREFIX, expire=60, key_builder=_product_cache_key)
 async def get_product(product_id: str):
     """Get product details by ID."""
     product = await product_crud.get_product_by_id(product_id)
@@ -224,18 +306,13 @@ async def get_product(product_id: str):
             detail="Product not found"
         )
     
-    # Convert to response format with category name
-    product_data = await product_to_response(product)
-    
-    return APIResponse(
-        success=True,
-        message="Product details retrieved successfully",
-        data=product_data.dict()
-    )
+    # Returned directly: response_model stays for OpenAPI but skips validation
+    return await _product_response(product, "Product details retrieved successfully")
 
 @router.put("/{product_id}", response_model=APIResponse)
 async def update_product(
     product_id: str,
+    background_tasks: BackgroundTasks,
     title: Optional[str] = Form(None, max_length=150),
     description: Optional[str] = Form(None, max_length=1000),
     short_description: Optional[str] = Form(None, max_length=50),
@@ -243,179 +320,129 @@ async def update_product(
     category_id: Optional[str] = Form(None),
     rating: Optional[float] = Form(None, ge=0.0, le=5.0),
     images: List[UploadFile] = File(default=[], description="Upload product images (max 5 files, replaces existing)"),
-    current_user: UserModel = Depends(get_current_admin_user)
+    current_user: UserSummary = Depends(get_current_admin_user)
 ):
     """Update product (Admin only)."""
+    # Check if product exists
+    existing_product = await product_crud.get_product_by_id(product_id, fetch_links=False)
+    if not existing_product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    # Reject locked products before anything is uploaded
+    if existing_product.is_locked:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot update locked product"
+        )
+    
+    # Filter out empty files (files with no filename)
+    valid_images = [img for img in images if img.filename and img.filename.strip()] if images else []
+    if len(valid_images) > 5:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maximum 5 images allowed per product"
+        )
+    
+    # Create update object
+    update_data = {}
+    if title is not None:
+        update_data["title"] = title
+    if description is not None:
+        update_data["description"] = description
+    if short_description is not None:
+        update_data["short_description"] = short_description
+    if price is not None:
+        update_data["price"] = price
+    if category_id is not None:
+        update_data["category_id"] = category_id
+    if rating is not None:
+        update_data["rating"] = rating
+    
+    if not update_data and not valid_images:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields provided for update"
+        )
+    
+    # Validated before uploading so a bad field doesn't leave new images behind
     try:
-        # Check if product exists
-        existing_product = await product_crud.get_product_by_id(product_id)
-        if not existing_product:
+        product_update = ProductUpdate(**update_data)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Handle new image uploads
+    image_paths = None
+    if valid_images:
+        image_paths = await upload_service.upload_product_images(valid_images)
+        product_update.images = image_paths
+    
+    try:
+        updated_product = await product_crud.update_product(product_id, product_update)
+        if not updated_product:
+            # Deleted since the existence check above
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Product not found"
             )
-        
-    # No word count constraint for short_description
-        
-        # Handle new image uploads
-        image_paths = None
-        if images and len(images) > 0:
-            # Filter out empty files (files with no filename)
-            valid_images = [img for img in images if img.filename and img.filename.strip()]
-            
-            if len(valid_images) > 5:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Maximum 5 images allowed per product"
-                )
-            
-            if valid_images:
-                # Delete old images
-                if existing_product.images:
-                    upload_service.delete_product_images(existing_product.images)
-                
-                # Upload new images
-                image_paths = await upload_service.upload_product_images(valid_images)
-        
-        # Create update object
-        update_data = {}
-        if title is not None:
-            update_data["title"] = title
-        if description is not None:
-            update_data["description"] = description
-        if short_description is not None:
-            update_data["short_description"] = short_description
-        if price is not None:
-            update_data["price"] = price
-        if category_id is not None:
-            update_data["category_id"] = category_id
-        if rating is not None:
-            update_data["rating"] = rating
-        if image_paths is not None:
-            update_data["images"] = image_paths
-        
-        if not update_data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No fields provided for update"
-            )
-        
-        product_update = ProductUpdate(**update_data)
-        updated_product = await product_crud.update_product(product_id, product_update)
-        
-        # Convert to response format with category name
-        product_data = await product_to_response(updated_product)
-        
-        return APIResponse(
-            success=True,
-            message="Product updated successfully",
-            data=product_data.dict()
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update product: {str(e)}"
-        )
+    except Exception:
+        # The update didn't happen; drop the images uploaded for it
+        if image_paths:
+            await asyncio.to_thread(upload_service.delete_product_images, image_paths)
+        raise
+    
+    # Old images are removed after the response is sent, and only once the update succeeded
+    if image_paths is not None and existing_product.images:
+        background_tasks.add_task(upload_service.delete_product_images, existing_product.images)
+    
+    return await _product_response(updated_product, "Product updated successfully")
 
 @router.delete("/{product_id}", response_model=APIResponse)
 async def delete_product(
     product_id: str,
-    current_user: UserModel = Depends(get_current_admin_user)
+    current_user: UserSummary = Depends(get_current_admin_user)
 ):
     """Delete product (Admin only)."""
-    try:
-        success = await product_crud.delete_product(product_id)
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Product not found"
-            )
-        
-        return APIResponse(
-            success=True,
-            message="Product deleted successfully",
-            data={"id": product_id}
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
+    success = await product_crud.delete_product(product_id)
+    if not success:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete product: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
         )
+    
+    return MongoJSONResponse({
+        "success": True,
+        "message": "Product deleted successfully",
+        "data": {"id": product_id}
+    })
 
 @router.patch("/{product_id}/lock", response_model=APIResponse)
 async def lock_product(
     product_id: str,
-    current_user: UserModel = Depends(get_current_admin_user)
+    current_user: UserSummary = Depends(get_current_admin_user)
 ):
     """Lock product to prevent modifications (Admin only)."""
-    try:
-        locked_product = await product_crud.lock_product(product_id)
-        if not locked_product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Product not found"
-            )
-        
-        # Fetch category name
-        category_name = None
-        if locked_product.category_id:
-            await locked_product.fetch_link(ProductModel.category_id)
-            category_name = locked_product.category_id.name if locked_product.category_id else None
-        
-        return APIResponse(
-            success=True,
-            message="Product locked successfully",
-            data={
-                "id": str(locked_product.id),
-                "title": locked_product.title,
-                "category_id": str(locked_product.category_id.id) if locked_product.category_id else None,
-                "category_name": category_name,
-                "is_locked": locked_product.is_locked
-            }
-        )
-    except Exception as e:
+    locked_product = await product_crud.lock_product(product_id)
+    if not locked_product:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to lock product: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
         )
+    
+    return _lock_response(await _ensure_category(locked_product), "Product locked successfully")
 
 @router.patch("/{product_id}/unlock", response_model=APIResponse)
 async def unlock_product(
     product_id: str,
-    current_user: UserModel = Depends(get_current_admin_user)
+    current_user: UserSummary = Depends(get_current_admin_user)
 ):
     """Unlock product to allow modifications (Admin only)."""
-    try:
-        unlocked_product = await product_crud.unlock_product(product_id)
-        if not unlocked_product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Product not found"
-            )
-        
-        # Fetch category name
-        category_name = None
-        if unlocked_product.category_id:
-            await unlocked_product.fetch_link(ProductModel.category_id)
-            category_name = unlocked_product.category_id.name if unlocked_product.category_id else None
-        
-        return APIResponse(
-            success=True,
-            message="Product unlocked successfully",
-            data={
-                "id": str(unlocked_product.id),
-                "title": unlocked_product.title,
-                "category_id": str(unlocked_product.category_id.id) if unlocked_product.category_id else None,
-                "category_name": category_name,
-                "is_locked": unlocked_product.is_locked
-            }
-        )
-    except Exception as e:
+    unlocked_product = await product_crud.unlock_product(product_id)
+    if not unlocked_product:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to unlock product: {str(e)}"
-        )
\ No newline at end of file
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    
+    return _lock_response(await _ensure_category(unlocked_product), "Product unlocked successfully")
\ No newline at end of file
@@ -1,15 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
+import asyncio
 from app.schemas import User, UserListResponse, APIResponse
 from app.crud.user import user_crud
 from app.dependencies.auth import get_current_user, get_current_admin_user
-from app.models import User as UserModel
+from app.models import UserSummary
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get("/me", response_model=APIResponse)
 async def get_current_user_info(
-    current_user: UserModel = Depends(get_current_user)
+    current_user: UserSummary = Depends(get_current_user)
 ):
     """Get current logged-in user details."""
     return APIResponse(
@@ -28,12 +29,15 @@ async def get_current_user_info(
 async def list_users(
     skip: int = 0,
     limit: int = 100,
-    current_user: UserModel = Depends(get_current_admin_user)
+    current_user: UserSummary = Depends(get_current_admin_user)
 ):
     """List all users (Admin only)."""
     try:
-        users = await user_crud.get_users(skip=skip, limit=limit)
-        total_count = await user_crud.get_users_count()
+        # Page and count are independent, so overlap the two round-trips
+        users, total_count = await asyncio.gather(
+            user_crud.get_users(skip=skip, limit=limit),
+            user_crud.get_users_count()
+        )
         
         users_data = []
         for user in users:
@@ -60,7 +64,7 @@ async def list_users(
 @router.get("/{user_id}", response_model=APIResponse)
 async def get_user_by_id(
     user_id: str,
-    current_user: UserModel = Depends(get_current_admin_user)
+    current_user: UserSummary = Depends(get_current_admin_user)
 ):
     """Get user by ID (Admin only)."""
     user = await user_crud.get_user_by_id(user_id)
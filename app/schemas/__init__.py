@@ -90,6 +90,9 @@ class ProductUpdate(BaseModel):
     
     # Removed word count constraint for short_description
 
+class ProductBulkIds(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=10000)
+
 class Product(ProductBase):
     id: str
     images: List[str]
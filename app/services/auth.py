@@ -1,15 +1,38 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Optional, Tuple
+from jose import JWTError, jwk, jwt
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes use Argon2id (OWASP parameters); bcrypt stays so existing hashes still verify
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1
+)
+
+# Build the JWT key object once; jose would otherwise construct it on every encode/decode
+_jwt_key = jwk.construct(settings.secret_key, settings.algorithm)
+_jwt_algorithms = [settings.algorithm]
+# Tokens must carry exp and sub; checks for claims this app never issues are skipped
+_jwt_decode_options = {
+    "require_exp": True,
+    "require_sub": True,
+    "verify_aud": False,
+    "verify_at_hash": False
+}
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the stored one is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return pwd_context.hash(password)
@@ -23,16 +46,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    encoded_jwt = jwt.encode(to_encode, _jwt_key, algorithm=settings.algorithm)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """Verify JWT token and return email."""
+def decode_access_token(token: str) -> Optional[dict]:
+    """Verify a JWT and return its payload, or None if it is invalid or lacks exp/sub."""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        return email
+        return jwt.decode(token, _jwt_key, algorithms=_jwt_algorithms, options=_jwt_decode_options)
     except JWTError:
         return None
+
+def verify_token(token: str) -> Optional[str]:
+    """Verify JWT token and return email."""
+    payload = decode_access_token(token)
+    return payload["sub"] if payload else None
@@ -0,0 +1,172 @@
+import hashlib
+import inspect
+import logging
+from functools import wraps
+from typing import Callable, Optional, Union
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from app.config import settings
+
+# Import Redis client (optional dependency)
+try:
+    import redis.asyncio as redis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+class RedisCache:
+    """Thin async wrapper around Redis used for cache-aside reads.
+
+    Every operation degrades to a cache miss / no-op when Redis is not
+    configured or unreachable, so callers can always fall back to MongoDB.
+    """
+
+    def __init__(self):
+        self.enabled = bool(REDIS_AVAILABLE and settings.redis_url)
+        self.default_ttl = settings.cache_ttl
+        self._client = None
+
+        if not self.enabled:
+            logger.info("Redis not configured, caching disabled")
+
+    @property
+    def client(self):
+        """Lazily create the connection pool on first use."""
+        if self._client is None:
+            pool = redis.ConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=20,
+                decode_responses=True
+            )
+            self._client = redis.Redis(connection_pool=pool)
+        return self._client
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a cached value, or None on miss."""
+        if not self.enabled:
+            return None
+        try:
+            return await self.client.get(key)
+        except RedisError as e:
+            logger.warning(f"Cache get failed for '{key}': {e}")
+            return None
+
+    async def set(self, key: str, value: str, expire: Optional[int] = None) -> None:
+        """Store a value with a TTL (defaults to settings.cache_ttl)."""
+        if not self.enabled:
+            return
+        try:
+            await self.client.setex(key, expire or self.default_ttl, value)
+        except RedisError as e:
+            logger.warning(f"Cache set failed for '{key}': {e}")
+
+    async def delete(self, *keys: str) -> None:
+        """Remove one or more keys."""
+        if not self.enabled or not keys:
+            return
+        try:
+            await self.client.delete(*keys)
+        except RedisError as e:
+            logger.warning(f"Cache delete failed for {keys}: {e}")
+
+    async def delete_pattern(self, pattern: str) -> None:
+        """Remove every key matching a glob pattern (uses SCAN, never KEYS)."""
+        if not self.enabled:
+            return
+        try:
+            keys = [key async for key in self.client.scan_iter(match=pattern, count=500)]
+            if keys:
+                await self.client.delete(*keys)
+        except RedisError as e:
+            logger.warning(f"Cache delete_pattern failed for '{pattern}': {e}")
+
+    async def acquire_lock(self, key: str, expire: int = 5) -> bool:
+        """Take a short-lived SETNX lock so only one caller repopulates a key."""
+        if not self.enabled:
+            return False
+        try:
+            return bool(await self.client.set(f"lock:{key}", "1", nx=True, ex=expire))
+        except RedisError as e:
+            logger.warning(f"Cache lock failed for '{key}': {e}")
+            return False
+
+    async def release_lock(self, key: str) -> None:
+        """Release a lock taken with acquire_lock."""
+        await self.delete(f"lock:{key}")
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+cache = RedisCache()
+
+def default_key_builder(func: Callable, *args, **kwargs) -> str:
+    """Deterministic key from the endpoint name and its arguments."""
+    raw = repr((func.__module__, func.__name__, args, sorted(kwargs.items())))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def etag_for(body: Union[str, bytes]) -> str:
+    """Weak validator for a rendered JSON body (weak, since compression may re-encode it)."""
+    if isinstance(body, str):
+        body = body.encode()
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+def cached(prefix: str, expire: int = 60, key_builder: Optional[Callable[..., str]] = None):
+    """Cache a JSON endpoint's serialized response in Redis under '{prefix}:{key}'.
+
+    Handlers may return a Pydantic model or an already-rendered JSON Response.
+    Hits are returned as a raw JSON Response, skipping the query and the
+    serialization pass. Writers invalidate with delete_pattern. Without Redis
+    every request runs the handler: a per-process cache could not be
+    invalidated across workers and would serve stale products.
+    
+    Responses carry an ETag derived from the body and ask clients to
+    revalidate; a request whose If-None-Match still matches gets an empty 304.
+    """
+    build_key = key_builder or default_key_builder
+
+    def decorator(func: Callable):
+        @wraps(func)
+        async def wrapper(*args, cache_request: Request, **kwargs):
+            key = f"{prefix}:{build_key(func, *args, **kwargs)}"
+            body = await cache.get(key)
+
+            if body is None:
+                result = await func(*args, **kwargs)
+                if isinstance(result, BaseModel):
+                    body = result.model_dump_json()
+                elif isinstance(result, Response) and result.status_code == 200:
+                    body = result.body
+                else:
+                    return result
+
+                await cache.set(key, body if isinstance(body, str) else body.decode(), expire)
+
+            # no-cache: clients may keep the body but must revalidate it, which is the 304 path
+            headers = {"ETag": etag_for(body), "Cache-Control": "no-cache"}
+            if etag_matches(cache_request.headers.get("if-none-match"), headers["ETag"]):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        # Expose the Request to FastAPI without adding it to every cached endpoint
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        ])
+        return wrapper
+    return decorator
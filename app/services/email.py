@@ -63,10 +63,14 @@ class EmailService:
         """Send welcome email to new user using template."""
         subject = "Welcome to PixelForge Studio!"
         display_name = user_name or user_email.split('@')[0].title()
-        body = self._render_template(
-            "welcome.html",
-            {"user_name": display_name}
-        )
+        try:
+            body = self._render_template(
+                "welcome.html",
+                {"user_name": display_name}
+            )
+        except Exception:
+            # Already logged by _render_template; runs as a background task, so never raise
+            return False
         return self.send_email([user_email], subject, body)
 
     def send_inquiry_notification(self, inquiry_data: dict, admin_email: str = None) -> bool:
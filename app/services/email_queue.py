@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class EmailQueue:
+    """In-process queue of outgoing emails drained by a fixed pool of workers.
+
+    Requests only pay for an enqueue; at most `workers` blocking SMTP sends run at
+    once (each on a thread), and bursts wait in the queue instead of piling up.
+    """
+
+    def __init__(self, workers: int, maxsize: int):
+        self.workers = workers
+        self.maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Create the queue and start the workers on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def enqueue(self, send: Callable[..., Any], *args: Any) -> bool:
+        """Queue a blocking send call; returns False if not running or the queue is full."""
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait((send, args))
+            return True
+        except asyncio.QueueFull:
+            logger.warning("Email queue full, falling back to inline background task")
+            return False
+
+    async def _worker(self) -> None:
+        while True:
+            send, args = await self._queue.get()
+            try:
+                await asyncio.to_thread(send, *args)
+            except Exception as e:
+                logger.error(f"Queued email failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Give queued emails a chance to go out, then stop the workers."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Email queue stopped with {self._queue.qsize()} unsent emails")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+email_queue = EmailQueue(settings.email_queue_workers, settings.email_queue_max_size)
@@ -1,10 +1,25 @@
+import asyncio
+import base64
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import UploadFile, HTTPException
 from imagekitio import ImageKit
+from imagekitio.exceptions.InternalServerException import InternalServerException
+from imagekitio.exceptions.TooManyRequestsException import TooManyRequestsException
 from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
 from app.config import settings
 
+# Transient ImageKit failures are retried with exponential backoff (0.5s, 1s)
+UPLOAD_ATTEMPTS = 3
+UPLOAD_RETRY_BASE_DELAY = 0.5  # seconds
+TRANSIENT_UPLOAD_ERRORS = (InternalServerException, TooManyRequestsException, RequestsConnectionError, Timeout)
+
+# Keep-alive connections to ImageKit; sized for the default to_thread pool (32 threads max)
+HTTP_POOL_MAXSIZE = 32
+
 class ImageKitService:
     def __init__(self):
         if not all([settings.imagekit_private_key, settings.imagekit_public_key, settings.imagekit_url_endpoint]):
@@ -15,8 +30,15 @@ class ImageKitService:
             public_key=settings.imagekit_public_key,
             url_endpoint=settings.imagekit_url_endpoint
         )
+        # The SDK calls requests.request(), which opens (and TLS-handshakes) a new
+        # connection per call; route its requests through one pooled Session instead
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self.imagekit.ik_request.request = self.http.request
         self.max_file_size = settings.max_file_size
-        self.allowed_extensions = settings.allowed_image_extensions.split(",")
+        self.allowed_extensions = settings.allowed_image_extensions_set
 
     def _validate_image(self, file: UploadFile) -> None:
         """Validate uploaded image file."""
@@ -28,7 +50,7 @@ class ImageKitService:
         if file_extension not in self.allowed_extensions:
             raise HTTPException(
                 status_code=400,
-                detail=f"File extension '{file_extension}' not allowed. Allowed: {', '.join(self.allowed_extensions)}"
+                detail=f"File extension '{file_extension}' not allowed. Allowed: {', '.join(sorted(self.allowed_extensions))}"
             )
         
         # Check file size
@@ -39,80 +61,108 @@ class ImageKitService:
             )
 
     async def upload_product_images(self, files: List[UploadFile]) -> List[str]:
-        """Upload multiple product images to ImageKit and return their URLs."""
+        """Upload multiple product images to ImageKit concurrently and return their URLs."""
         if len(files) > 5:
             raise HTTPException(status_code=400, detail="Maximum 5 images allowed per product")
         
-        uploaded_urls = []
-        
+        # Reject bad names/sizes before anything is sent
         for file in files:
             self._validate_image(file)
+        
+        results = await asyncio.gather(
+            *(self._upload_image(file) for file in files),
+            return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            # Don't leave the images that did succeed behind on ImageKit
+            uploaded = [result for result in results if not isinstance(result, BaseException)]
+            await asyncio.to_thread(self._delete_uploaded_images, uploaded)
+            raise errors[0]
+        return [url for url, _ in results]
+
+    def _delete_uploaded_images(self, uploaded: List[Tuple[str, Optional[str]]]) -> None:
+        """Delete images uploaded by this request, by file ID when ImageKit returned one."""
+        for url, file_id in uploaded:
+            if not file_id:
+                self.delete_product_images([url])
+                continue
+            try:
+                self.imagekit.delete_file(file_id)
+            except Exception as e:
+                print(f"Warning: Failed to delete image {url} from ImageKit: {str(e)}")
+
+    async def _upload_image(self, file: UploadFile) -> Tuple[str, Optional[str]]:
+        """Upload one validated image to ImageKit and return its URL and file ID."""
+        # Generate unique filename
+        file_extension = file.filename.split(".")[-1].lower()
+        unique_filename = f"product_{uuid.uuid4()}.{file_extension}"
+        
+        try:
+            # Read and base64-encode (for ImageKit SDK compatibility) on a worker thread
+            file_content_b64 = await asyncio.to_thread(self._read_base64, file)
             
-            # Generate unique filename
-            file_extension = file.filename.split(".")[-1].lower()
-            unique_filename = f"product_{uuid.uuid4()}.{file_extension}"
+            result = await self._upload_file_with_retry(file_content_b64, unique_filename)
             
-            try:
-                # Read file content
-                file_content = await file.read()
-                
-                # Convert to base64 for ImageKit SDK compatibility
-                import base64
-                file_content_b64 = base64.b64encode(file_content).decode('utf-8')
-                
-                # Upload to ImageKit using base64 encoded content
-                result = self.imagekit.upload_file(
-                    file=file_content_b64,
-                    file_name=unique_filename,
-                    options=UploadFileRequestOptions(
-                        folder="/products/",
-                        use_unique_file_name=True,
-                        tags=["product", "image"]
-                    )
+            # Check if upload was successful
+            if isinstance(result, dict):
+                error = result.get('error')
+                url = result.get('url')
+                file_id = result.get('file_id') or result.get('fileId')
+            else:
+                # Handle object response
+                error = getattr(result, 'error', None)
+                url = getattr(result, 'url', None)
+                file_id = getattr(result, 'file_id', None)
+            
+            if error:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"ImageKit upload failed: {error}"
                 )
-                
-                # Check if upload was successful
-                if isinstance(result, dict):
-                    if result.get('error'):
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"ImageKit upload failed: {result['error']}"
-                        )
-                    
-                    # Store the URL for database
-                    if result.get('url'):
-                        uploaded_urls.append(result['url'])
-                    else:
-                        raise HTTPException(
-                            status_code=500,
-                            detail="ImageKit upload succeeded but no URL returned"
-                        )
-                else:
-                    # Handle object response
-                    if hasattr(result, 'error') and result.error:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"ImageKit upload failed: {result.error}"
-                        )
-                    
-                    # Store the URL for database
-                    if hasattr(result, 'url') and result.url:
-                        uploaded_urls.append(result.url)
-                    else:
-                        raise HTTPException(
-                            status_code=500,
-                            detail="ImageKit upload succeeded but no URL returned"
-                        )
-                
-            except Exception as e:
-                if isinstance(e, HTTPException):
-                    raise e
+            
+            # Store the URL for database
+            if not url:
                 raise HTTPException(
                     status_code=500,
-                    detail=f"Failed to upload image to ImageKit: {str(e)}"
+                    detail="ImageKit upload succeeded but no URL returned"
                 )
-        
-        return uploaded_urls
+            return url, file_id
+            
+        except Exception as e:
+            if isinstance(e, HTTPException):
+                raise e
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to upload image to ImageKit: {str(e)}"
+            )
+
+    @staticmethod
+    def _read_base64(file: UploadFile) -> str:
+        """Read a spooled upload and return its base64 encoding."""
+        file.file.seek(0)
+        return base64.b64encode(file.file.read()).decode('utf-8')
+
+    async def _upload_file_with_retry(self, file_content_b64: str, file_name: str):
+        """Call the SDK upload, retrying transient ImageKit/network failures."""
+        options = UploadFileRequestOptions(
+            folder="/products/",
+            use_unique_file_name=True,
+            tags=["product", "image"]
+        )
+        for attempt in range(UPLOAD_ATTEMPTS):
+            try:
+                # The SDK call is a blocking HTTP request; run it on a worker thread
+                return await asyncio.to_thread(
+                    self.imagekit.upload_file,
+                    file=file_content_b64,
+                    file_name=file_name,
+                    options=options
+                )
+            except TRANSIENT_UPLOAD_ERRORS:
+                if attempt == UPLOAD_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(UPLOAD_RETRY_BASE_DELAY * 2 ** attempt)
 
     def delete_product_images(self, image_urls: List[str]) -> None:
         """Delete product images from ImageKit."""
@@ -209,3 +259,10 @@ def get_imagekit_service() -> ImageKitService:
     if _imagekit_service is None:
         _imagekit_service = ImageKitService()
     return _imagekit_service
+
+def close_imagekit_service() -> None:
+    """Close the pooled ImageKit connections, if the service was ever used."""
+    global _imagekit_service
+    if _imagekit_service is not None:
+        _imagekit_service.http.close()
+        _imagekit_service = None
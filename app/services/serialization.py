@@ -0,0 +1,22 @@
+from typing import Any
+import orjson
+from bson import DBRef, ObjectId
+from fastapi.responses import ORJSONResponse
+
+def orjson_default(obj: Any) -> Any:
+    """Encode the BSON types orjson does not know about; called only for those values."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, DBRef):
+        return str(obj.id)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Serialize a payload of plain dicts/lists straight from MongoDB documents."""
+    return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+class MongoJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also accepts ObjectId/DBRef values in the payload."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,48 @@
+import hashlib
+import time
+from typing import Optional
+from cachetools import TTLCache
+from app.config import settings
+from app.models import UserSummary
+
+class TokenCache:
+    """Short-lived cache of verified access tokens and the users they resolve to.
+    
+    Lets repeated requests with the same bearer token skip JWT verification and
+    the user lookup. Entries never outlive the token's own exp claim.
+    """
+    
+    def __init__(self, maxsize: int, ttl: int):
+        # Only touched from the event loop without awaiting in between, so no lock is needed
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """Hash the token so raw credentials are never kept in memory as keys."""
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, token: str) -> Optional[UserSummary]:
+        """Return the cached user for a token, or None on miss or expiry."""
+        key = self._key(token)
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        
+        user, exp = entry
+        if exp <= time.time():
+            self._cache.pop(key, None)
+            return None
+        return user
+    
+    def set(self, token: str, user: UserSummary, exp: float) -> None:
+        """Remember the user a verified token resolved to until the TTL or exp, whichever is first."""
+        self._cache[self._key(token)] = (user, exp)
+    
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._cache.clear()
+
+token_cache = TokenCache(
+    maxsize=settings.token_cache_max_entries,
+    ttl=settings.token_cache_ttl
+)
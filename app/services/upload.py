@@ -1,13 +1,18 @@
+import asyncio
 import os
+import shutil
 import uuid
 from typing import List
 from fastapi import UploadFile, HTTPException
 from PIL import Image
 from app.config import settings
 
+# Copy uploads in bounded chunks instead of reading whole bodies into memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
 # Import ImageKit service
 try:
-    from app.services.imagekit_service import get_imagekit_service
+    from app.services.imagekit_service import get_imagekit_service, close_imagekit_service
     IMAGEKIT_AVAILABLE = True
 except ImportError:
     IMAGEKIT_AVAILABLE = False
@@ -17,7 +22,7 @@ class FileUploadService:
         self.upload_dir = settings.upload_dir
         self.products_dir = os.path.join(self.upload_dir, "products")
         self.max_file_size = settings.max_file_size
-        self.allowed_extensions = settings.allowed_image_extensions.split(",")
+        self.allowed_extensions = settings.allowed_image_extensions_set
         
         # Check if ImageKit is configured
         self.use_imagekit = (
@@ -42,7 +47,7 @@ class FileUploadService:
         if file_extension not in self.allowed_extensions:
             raise HTTPException(
                 status_code=400,
-                detail=f"File extension '{file_extension}' not allowed. Allowed: {', '.join(self.allowed_extensions)}"
+                detail=f"File extension '{file_extension}' not allowed. Allowed: {', '.join(sorted(self.allowed_extensions))}"
             )
         
         # Check file size
@@ -66,38 +71,50 @@ class FileUploadService:
             return await self._upload_local_images(files)
 
     async def _upload_local_images(self, files: List[UploadFile]) -> List[str]:
-        """Upload images to local storage (fallback method)."""
-        uploaded_paths = []
-        
+        """Upload images to local storage (fallback method), all files concurrently."""
+        # Reject bad names/sizes before any file is written
         for file in files:
             self._validate_image(file)
-            
-            # Generate unique filename
-            file_extension = file.filename.split(".")[-1].lower()
-            unique_filename = f"{uuid.uuid4()}.{file_extension}"
-            file_path = os.path.join(self.products_dir, unique_filename)
-            
-            try:
-                # Save file
-                content = await file.read()
-                with open(file_path, 'wb') as f:
-                    f.write(content)
-                
-                # Validate image integrity using PIL
-                with Image.open(file_path) as img:
-                    img.verify()
-                
-                # Return relative path for database storage
-                relative_path = f"uploads/products/{unique_filename}"
-                uploaded_paths.append(relative_path)
-                
-            except Exception as e:
-                # Clean up file if it was created
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                raise HTTPException(status_code=400, detail=f"Failed to process image: {str(e)}")
         
-        return uploaded_paths
+        results = await asyncio.gather(
+            *(self._upload_local_image(file) for file in files),
+            return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            # Don't leave the images that did succeed behind
+            self._delete_local_images([result for result in results if isinstance(result, str)])
+            raise errors[0]
+        return results
+
+    async def _upload_local_image(self, file: UploadFile) -> str:
+        """Store one validated image and return its relative path."""
+        # Generate unique filename
+        file_extension = file.filename.split(".")[-1].lower()
+        unique_filename = f"{uuid.uuid4()}.{file_extension}"
+        file_path = os.path.join(self.products_dir, unique_filename)
+        
+        try:
+            # Blocking copy and PIL check run off the event loop
+            await asyncio.to_thread(self._store_local_image, file, file_path)
+        except Exception as e:
+            # Clean up file if it was created
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise HTTPException(status_code=400, detail=f"Failed to process image: {str(e)}")
+        
+        # Return relative path for database storage
+        return f"uploads/products/{unique_filename}"
+
+    def _store_local_image(self, file: UploadFile, file_path: str) -> None:
+        """Stream the spooled upload to disk and verify it is a readable image."""
+        file.file.seek(0)
+        with open(file_path, 'wb') as f:
+            shutil.copyfileobj(file.file, f, UPLOAD_CHUNK_SIZE)
+        
+        # Validate image integrity using PIL
+        with Image.open(file_path) as img:
+            img.verify()
 
     def delete_product_images(self, image_paths: List[str]) -> None:
         """Delete product images from storage."""
@@ -109,6 +126,11 @@ class FileUploadService:
             # Fallback to local storage deletion
             self._delete_local_images(image_paths)
 
+    def close(self) -> None:
+        """Release pooled ImageKit connections on shutdown."""
+        if IMAGEKIT_AVAILABLE:
+            close_imagekit_service()
+
     def _delete_local_images(self, image_paths: List[str]) -> None:
         """Delete product images from local filesystem."""
         for path in image_paths:
@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for production.
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+Gunicorn supervises one UvicornWorker per core and restarts any that die or hang.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Uses uvloop and httptools when installed (uvicorn[standard])
+worker_class = "uvicorn.workers.UvicornWorker"
+# Workers share response caches only through Redis (REDIS_URL); none is kept per process
+
+# Per-request access logging costs more than the hot endpoints themselves
+accesslog = None
+
+timeout = 30
+# Leaves time for the lifespan shutdown to flush queued emails
+graceful_timeout = 30
+keepalive = 5
@@ -1,15 +1,35 @@
 #!/usr/bin/env python3
 """
 PixelForge Backend Development Server
+
+Runs on uvloop/httptools (installed with uvicorn[standard]). Set RELOAD=false
+to run like production: several workers without per-request access logging.
 """
+import os
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        reload_dirs=["app"],
-        log_level="info"
-    )
+    reload = os.getenv("RELOAD", "true").lower() in ("1", "true", "yes")
+    
+    if reload:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            reload_dirs=["app"],
+            loop="uvloop",
+            http="httptools",
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            loop="uvloop",
+            http="httptools",
+            access_log=False,
+            log_level="info"
+        )
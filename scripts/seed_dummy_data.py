@@ -4,24 +4,23 @@ Dummy data seeding script for PixelForge Backend
 Inserts realistic sample data for testing and development
 """
 
+import asyncio
 import sys
 import os
-import random
-from datetime import datetime, timedelta
 
 # Add the parent directory to the path to import app modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from beanie.operators import In
+from app.database import connect_to_mongo, close_mongo_connection, init_db
+from app.models import Product, User, UserRole
 from app.crud.user import user_crud
 from app.crud.product import product_crud
 from app.crud.category import category_crud
 from app.schemas import UserCreate, ProductCreate, CategoryCreate
 
-def create_dummy_users():
+async def create_dummy_users():
     """Create 10 dummy users with varied profiles."""
-    db = SessionLocal()
     try:
         dummy_users = [
             {"email": "alice.johnson@example.com", "password": "password123", "role": "USER"},
@@ -38,7 +37,7 @@ def create_dummy_users():
         
         created_users = []
         for user_data in dummy_users:
-            existing_user = user_crud.get_user_by_email(db, user_data["email"])
+            existing_user = await user_crud.get_user_by_email(user_data["email"])
             if existing_user:
                 print(f"✓ User already exists: {user_data['email']}")
                 created_users.append(existing_user)
@@ -46,13 +45,12 @@ def create_dummy_users():
             
             # Create user
             user_create = UserCreate(email=user_data["email"], password=user_data["password"])
-            user = user_crud.create_user(db, user_create)
+            user = await user_crud.create_user(user_create)
             
             # Set role if not default
             if user_data["role"] != "USER":
                 user.role = user_data["role"]
-                db.commit()
-                db.refresh(user)
+                await user.save()
             
             created_users.append(user)
             print(f"✓ Created user: {user_data['email']} ({user_data['role']})")
@@ -61,14 +59,10 @@ def create_dummy_users():
         
     except Exception as e:
         print(f"✗ Failed to create dummy users: {str(e)}")
-        db.rollback()
         return []
-    finally:
-        db.close()
 
-def create_dummy_categories():
+async def create_dummy_categories():
     """Create dummy categories."""
-    db = SessionLocal()
     try:
         dummy_categories = [
             {"name": "Photo Magnets", "description": "Custom photo magnets for your memories"},
@@ -78,7 +72,7 @@ def create_dummy_categories():
         
         created_categories = []
         for category_data in dummy_categories:
-            existing_category = category_crud.get_category_by_name(db, category_data["name"])
+            existing_category = await category_crud.get_category_by_name(category_data["name"])
             if existing_category:
                 print(f"✓ Category already exists: {category_data['name']}")
                 created_categories.append(existing_category)
@@ -89,7 +83,7 @@ def create_dummy_categories():
                 name=category_data["name"], 
                 description=category_data["description"]
             )
-            category = category_crud.create_category(db, category_create)
+            category = await category_crud.create_category(category_create)
             created_categories.append(category)
             print(f"✓ Created category: {category_data['name']}")
         
@@ -97,19 +91,15 @@ def create_dummy_categories():
         
     except Exception as e:
         print(f"✗ Failed to create dummy categories: {str(e)}")
-        db.rollback()
         return []
-    finally:
-        db.close()
 
-def create_dummy_products():
+async def create_dummy_products():
     """Create 10 dummy products with varied categories and properties."""
-    db = SessionLocal()
     try:
         # Get category IDs
-        photo_magnets_cat = category_crud.get_category_by_name(db, "Photo Magnets")
-        fridge_magnets_cat = category_crud.get_category_by_name(db, "Fridge Magnets")
-        retro_prints_cat = category_crud.get_category_by_name(db, "Retro Prints")
+        photo_magnets_cat = await category_crud.get_category_by_name("Photo Magnets")
+        fridge_magnets_cat = await category_crud.get_category_by_name("Fridge Magnets")
+        retro_prints_cat = await category_crud.get_category_by_name("Retro Prints")
         
         if not all([photo_magnets_cat, fridge_magnets_cat, retro_prints_cat]):
             raise ValueError("Required categories not found. Please create categories first.")
@@ -120,7 +110,7 @@ def create_dummy_products():
                 "description": "A beautiful vintage-style magnet featuring your family portrait. Perfect for preserving precious memories on your refrigerator or any magnetic surface.",
                 "short_description": "Vintage family portrait magnet",
                 "price": 24.99,
-                "category_id": photo_magnets_cat.id,
+                "category_id": str(photo_magnets_cat.id),
                 "rating": 4.8,
                 "images": ["family_portrait_1.jpg", "family_portrait_2.jpg"],
                 "is_locked": False
@@ -130,7 +120,7 @@ def create_dummy_products():
                 "description": "Celebrate your special day with this elegant wedding memory magnet set. Features high-quality printing and durable magnetic backing.",
                 "short_description": "Wedding memory magnet set",
                 "price": 35.50,
-                "category_id": photo_magnets_cat.id,
+                "category_id": str(photo_magnets_cat.id),
                 "rating": 4.9,
                 "images": ["wedding_magnet_1.jpg"],
                 "is_locked": False
@@ -140,7 +130,7 @@ def create_dummy_products():
                 "description": "Document your baby's precious first year with this adorable collection of photo magnets. Includes monthly milestone templates.",
                 "short_description": "Baby first year collection",
                 "price": 42.00,
-                "category_id": photo_magnets_cat.id,
+                "category_id": str(photo_magnets_cat.id),
                 "rating": 4.7,
                 "images": ["baby_collection_1.jpg", "baby_collection_2.jpg", "baby_collection_3.jpg"],
                 "is_locked": True
@@ -150,7 +140,7 @@ def create_dummy_products():
                 "description": "Add some personality to your kitchen with this adorable cool cat fridge magnet. Features a fun cartoon design that will make you smile every day.",
                 "short_description": "Cool cat fridge magnet",
                 "price": 12.99,
-                "category_id": fridge_magnets_cat.id,
+                "category_id": str(fridge_magnets_cat.id),
                 "rating": 4.3,
                 "images": ["cool_cat_magnet.jpg"],
                 "is_locked": False
@@ -160,7 +150,7 @@ def create_dummy_products():
                 "description": "Inspire yourself daily with these motivational quote magnets. Perfect for your workspace or kitchen to keep you motivated throughout the day.",
                 "short_description": "Motivational quote magnet set",
                 "price": 18.75,
-                "category_id": fridge_magnets_cat.id,
+                "category_id": str(fridge_magnets_cat.id),
                 "rating": 4.2,
                 "images": ["motivational_1.jpg", "motivational_2.jpg"],
                 "is_locked": False
@@ -170,7 +160,7 @@ def create_dummy_products():
                 "description": "These playful kitchen utensil magnets are perfect for organizing your recipes and notes. Features colorful designs of various cooking tools.",
                 "short_description": "Kitchen utensils fun magnets",
                 "price": 22.30,
-                "category_id": fridge_magnets_cat.id,
+                "category_id": str(fridge_magnets_cat.id),
                 "rating": 4.5,
                 "images": ["kitchen_utensils.jpg"],
                 "is_locked": False
@@ -180,7 +170,7 @@ def create_dummy_products():
                 "description": "Step back in time with this authentic 1950s diner retro print. Features classic American diner aesthetics with vibrant colors and nostalgic charm.",
                 "short_description": "Classic 1950s diner print",
                 "price": 45.00,
-                "category_id": retro_prints_cat.id,
+                "category_id": str(retro_prints_cat.id),
                 "rating": 4.6,
                 "images": ["diner_retro_1.jpg", "diner_retro_2.jpg"],
                 "is_locked": False
@@ -190,7 +180,7 @@ def create_dummy_products():
                 "description": "A stunning collection print featuring iconic classic cars from the golden age of automobiles. Perfect for car enthusiasts and vintage lovers.",
                 "short_description": "Classic car collection print",
                 "price": 38.99,
-                "category_id": retro_prints_cat.id,
+                "category_id": str(retro_prints_cat.id),
                 "rating": 4.4,
                 "images": ["classic_cars.jpg"],
                 "is_locked": True
@@ -200,7 +190,7 @@ def create_dummy_products():
                 "description": "Bring wanderlust to your walls with these vintage travel posters. Features iconic destinations from around the world in classic poster style.",
                 "short_description": "Vintage travel poster collection",
                 "price": 52.50,
-                "category_id": retro_prints_cat.id,
+                "category_id": str(retro_prints_cat.id),
                 "rating": 4.8,
                 "images": ["travel_poster_1.jpg", "travel_poster_2.jpg", "travel_poster_3.jpg"],
                 "is_locked": False
@@ -210,23 +200,26 @@ def create_dummy_products():
                 "description": "Celebrate the elegance of Art Deco architecture with this sophisticated print. Features geometric patterns and iconic building designs.",
                 "short_description": "Art Deco architecture print",
                 "price": 48.75,
-                "category_id": retro_prints_cat.id,
+                "category_id": str(retro_prints_cat.id),
                 "rating": 4.7,
                 "images": ["art_deco_1.jpg"],
                 "is_locked": False
             }
         ]
         
-        created_products = []
-        for product_data in dummy_products:
-            # Check if product with same title already exists
-            existing_products = product_crud.get_products(db, skip=0, limit=100)
-            if any(p.title == product_data["title"] for p in existing_products):
-                print(f"✓ Product already exists: {product_data['title']}")
-                continue
-            
-            # Create product
-            product_create = ProductCreate(
+        # Skip products that already exist with a single query
+        titles = [product_data["title"] for product_data in dummy_products]
+        existing_titles = {
+            product.title for product in await Product.find(In(Product.title, titles)).to_list()
+        }
+        for title in (t for t in titles if t in existing_titles):
+            print(f"✓ Product already exists: {title}")
+        
+        new_products = [p for p in dummy_products if p["title"] not in existing_titles]
+        
+        # Insert everything in one batch, then lock the flagged products with one update
+        inserted = await product_crud.create_products_stream(
+            ProductCreate(
                 title=product_data["title"],
                 description=product_data["description"],
                 short_description=product_data["short_description"],
@@ -235,54 +228,47 @@ def create_dummy_products():
                 rating=product_data["rating"],
                 images=product_data["images"]
             )
-            
-            product = product_crud.create_product(db, product_create)
-            
-            # Set locked status if specified
-            if product_data["is_locked"]:
-                product.is_locked = True
-                db.commit()
-                db.refresh(product)
-            
-            created_products.append(product)
+            for product_data in new_products
+        )
+        
+        locked_titles = [p["title"] for p in new_products if p["is_locked"]]
+        if locked_titles:
+            await Product.find(In(Product.title, locked_titles)).update(
+                {"$set": {"is_locked": True}}
+            )
+        
+        for product_data in new_products:
             lock_status = " (LOCKED)" if product_data["is_locked"] else ""
             print(f"✓ Created product: {product_data['title']} - ${product_data['price']}{lock_status}")
         
-        return created_products
+        return inserted
         
     except Exception as e:
         print(f"✗ Failed to create dummy products: {str(e)}")
-        db.rollback()
-        return []
-    finally:
-        db.close()
+        return 0
 
-def display_statistics():
+async def display_statistics():
     """Display current database statistics."""
-    db = SessionLocal()
     try:
         # Count users
-        all_users = user_crud.get_users(db, skip=0, limit=1000)
-        total_users = len(all_users)
-        admin_users = len([u for u in all_users if u.role.upper() == "ADMIN"])
+        total_users = await User.find().count()
+        admin_users = await User.find(User.role == UserRole.ADMIN).count()
         regular_users = total_users - admin_users
         
         # Count products by category and status
-        all_products = product_crud.get_products(db, skip=0, limit=1000)
-        total_products = len(all_products)
+        total_products = await Product.find().count()
         
         # Get categories
-        photo_magnets_cat = category_crud.get_category_by_name(db, "Photo Magnets")
-        fridge_magnets_cat = category_crud.get_category_by_name(db, "Fridge Magnets")
-        retro_prints_cat = category_crud.get_category_by_name(db, "Retro Prints")
+        photo_magnets_cat = await category_crud.get_category_by_name("Photo Magnets")
+        fridge_magnets_cat = await category_crud.get_category_by_name("Fridge Magnets")
+        retro_prints_cat = await category_crud.get_category_by_name("Retro Prints")
         
-        photo_magnets = len([p for p in all_products if p.category_id == photo_magnets_cat.id]) if photo_magnets_cat else 0
-        fridge_magnets = len([p for p in all_products if p.category_id == fridge_magnets_cat.id]) if fridge_magnets_cat else 0
-        retro_prints = len([p for p in all_products if p.category_id == retro_prints_cat.id]) if retro_prints_cat else 0
+        photo_magnets = await Product.find({"category_id.$id": photo_magnets_cat.id}).count() if photo_magnets_cat else 0
+        fridge_magnets = await Product.find({"category_id.$id": fridge_magnets_cat.id}).count() if fridge_magnets_cat else 0
+        retro_prints = await Product.find({"category_id.$id": retro_prints_cat.id}).count() if retro_prints_cat else 0
         
-        locked_products = len([p for p in all_products if p.is_locked])
+        locked_products = await Product.find(Product.is_locked == True).count()
         unlocked_products = total_products - locked_products
-        
         print("📊 Database Statistics:")
         print(f"   • Total Users: {total_users}")
         print(f"     - Admin Users: {admin_users}")
@@ -297,31 +283,32 @@ def display_statistics():
         
     except Exception as e:
         print(f"✗ Failed to get statistics: {str(e)}")
-    finally:
-        db.close()
 
-def main():
+async def main():
     """Main seeding function."""
     print("🌱 Seeding PixelForge Database with Dummy Data...")
     print("=" * 55)
     
+    await connect_to_mongo()
+    await init_db()
+    
     # Create dummy categories
     print("🏷️  Creating dummy categories...")
-    categories = create_dummy_categories()
+    categories = await create_dummy_categories()
     print(f"   Created/Found {len(categories)} categories\n")
     
     # Create dummy users
     print("👥 Creating dummy users...")
-    users = create_dummy_users()
+    users = await create_dummy_users()
     print(f"   Created/Found {len(users)} users\n")
     
     # Create dummy products
     print("🎨 Creating dummy products...")
-    products = create_dummy_products()
-    print(f"   Created/Found {len(products)} products\n")
+    products = await create_dummy_products()
+    print(f"   Created {products} products\n")
     
     print("=" * 55)
-    display_statistics()
+    await display_statistics()
     print()
     print("🔐 Dummy User Credentials (all use password: 'password123'):")
     print("   • alice.johnson@example.com")
@@ -336,6 +323,8 @@ def main():
     print("   • jack.martinez@example.com")
     print()
     print("✅ Dummy data seeding completed successfully!")
+    
+    await close_mongo_connection()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
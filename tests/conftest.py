@@ -0,0 +1,68 @@
+import httpx
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from app.crud.category import category_crud
+from app.database import db
+from app.main import app
+from app.models import Category, Product, User
+from app.services.auth import create_access_token, get_password_hash
+from app.services.token_cache import token_cache
+
+ADMIN_EMAIL = "admin@example.com"
+
+
+@pytest_asyncio.fixture
+async def database():
+    """Point Beanie at a fresh in-memory MongoDB for each test."""
+    client = AsyncMongoMockClient()
+    db.client = client
+    db.database = client["pixelforge_test"]
+    await init_beanie(database=db.database, document_models=[User, Product, Category])
+    
+    category_crud._categories = {}
+    category_crud._categories_loaded_at = None
+    token_cache.clear()
+    yield db.database
+    token_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def client(database):
+    """HTTP client bound to the app; unhandled errors surface as 500 responses."""
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest_asyncio.fixture
+async def admin_headers(database):
+    """Bearer headers for a freshly inserted admin user."""
+    await User(email=ADMIN_EMAIL, hashed_password=get_password_hash("admin-password"), role="ADMIN").insert()
+    return {"Authorization": f"Bearer {create_access_token({'sub': ADMIN_EMAIL})}"}
+
+
+@pytest_asyncio.fixture
+async def category_id(client, admin_headers):
+    """ID of an active category created through the API."""
+    response = await client.post(
+        "/categories/", json={"name": "Magnets", "description": "Fridge magnets"}, headers=admin_headers
+    )
+    assert response.status_code == 201
+    return response.json()["data"]["id"]
+
+
+@pytest.fixture
+def make_products(client, admin_headers, category_id):
+    """Bulk-create products in the test category and return their IDs."""
+    async def _make(count: int = 3):
+        payload = [
+            {"title": f"Product {i}", "price": 10.0 + i, "category_id": category_id}
+            for i in range(count)
+        ]
+        response = await client.post("/products/bulk", json=payload, headers=admin_headers)
+        assert response.status_code == 201
+        return response.json()["data"]["ids"]
+    return _make
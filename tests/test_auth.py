@@ -0,0 +1,73 @@
+import time
+from datetime import datetime
+
+import pytest
+from beanie import PydanticObjectId
+from passlib.context import CryptContext
+
+from app.models import User, UserSummary
+from app.services.auth import create_access_token
+from app.services.token_cache import TokenCache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_login_rehashes_legacy_bcrypt_password(client, database):
+    legacy_hash = CryptContext(schemes=["bcrypt"]).hash("legacy-password")
+    await User(email="legacy@example.com", hashed_password=legacy_hash, role="USER").insert()
+    
+    response = await client.post(
+        "/auth/login", json={"email": "legacy@example.com", "password": "legacy-password"}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["access_token"]
+    
+    user = await User.find_one(User.email == "legacy@example.com")
+    assert user.hashed_password.startswith("$argon2")
+    
+    # The upgraded hash still verifies
+    response = await client.post(
+        "/auth/login", json={"email": "legacy@example.com", "password": "legacy-password"}
+    )
+    assert response.status_code == 200
+
+
+async def test_login_rejects_wrong_password(client, database):
+    legacy_hash = CryptContext(schemes=["bcrypt"]).hash("legacy-password")
+    await User(email="legacy@example.com", hashed_password=legacy_hash, role="USER").insert()
+    
+    response = await client.post(
+        "/auth/login", json={"email": "legacy@example.com", "password": "wrong-password"}
+    )
+    assert response.status_code == 401
+    
+    user = await User.find_one(User.email == "legacy@example.com")
+    assert user.hashed_password == legacy_hash
+
+
+async def test_verified_token_is_served_from_cache(client, admin_headers):
+    assert (await client.get("/users/me", headers=admin_headers)).status_code == 200
+    
+    # A cached token skips the user lookup until it expires
+    await User.find_all().delete()
+    assert (await client.get("/users/me", headers=admin_headers)).status_code == 200
+
+
+async def test_token_cache_entries_expire_with_the_token():
+    cache = TokenCache(maxsize=16, ttl=300)
+    now = datetime.utcnow()
+    user = UserSummary(_id=PydanticObjectId(), email="user@example.com", role="USER", created_at=now, updated_at=now)
+    
+    cache.set("live", user, time.time() + 60)
+    cache.set("expired", user, time.time() - 1)
+    
+    assert cache.get("live") == user
+    assert cache.get("expired") is None
+
+
+async def test_unknown_user_token_is_rejected(client, database):
+    token = create_access_token({"sub": "nobody@example.com"})
+    
+    response = await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    
+    assert response.status_code == 401
@@ -0,0 +1,98 @@
+import orjson
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _create_categories(client, headers, names):
+    ids = []
+    for name in names:
+        response = await client.post("/categories/", json={"name": name}, headers=headers)
+        assert response.status_code == 201
+        ids.append(response.json()["data"]["id"])
+    return ids
+
+
+async def test_keyset_pagination_with_after_id(client, admin_headers):
+    ids = await _create_categories(client, admin_headers, ["Alpha", "Beta", "Gamma"])
+    
+    first_page = (await client.get("/categories/", params={"limit": 2})).json()
+    assert [c["id"] for c in first_page["data"]] == ids[:2]
+    assert first_page["total"] == 3
+    
+    next_page = (await client.get("/categories/", params={"limit": 2, "after_id": ids[1]})).json()
+    assert [c["id"] for c in next_page["data"]] == ids[2:]
+
+
+async def test_pages_are_in_id_order_regardless_of_insertion_order(client, database):
+    from bson import ObjectId
+    from app.models import Category
+    ids = sorted(ObjectId() for _ in range(4))
+    # Insert newest id first so natural order disagrees with _id order
+    for i, oid in reversed(list(enumerate(ids))):
+        await Category(id=oid, name=f"Category {i}").insert()
+    
+    first_page = (await client.get("/categories/", params={"limit": 2})).json()
+    assert [c["id"] for c in first_page["data"]] == [str(oid) for oid in ids[:2]]
+    
+    cursor = first_page["data"][-1]["id"]
+    next_page = (await client.get("/categories/", params={"limit": 2, "after_id": cursor})).json()
+    assert [c["id"] for c in next_page["data"]] == [str(oid) for oid in ids[2:]]
+
+
+async def test_invalid_after_id_returns_400(client, database):
+    response = await client.get("/categories/", params={"after_id": "not-an-id"})
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid after_id"
+
+
+async def test_invalid_after_id_is_rejected_before_counting(client, monkeypatch, database):
+    from app.crud.category import category_crud
+    counted = []
+    
+    async def get_categories_count(active_only=False):
+        counted.append(active_only)
+        return 0
+    monkeypatch.setattr(category_crud, "get_categories_count", get_categories_count)
+    
+    response = await client.get("/categories/", params={"after_id": "not-an-id"})
+    
+    assert response.status_code == 400
+    assert counted == []
+
+
+async def test_export_categories_streams_ndjson(client, admin_headers):
+    ids = await _create_categories(client, admin_headers, ["Alpha", "Beta"])
+    await client.delete(f"/categories/{ids[1]}", headers=admin_headers)
+    
+    response = await client.get("/categories/export", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [(row["id"], row["is_active"]) for row in rows] == [(ids[0], True), (ids[1], False)]
+    
+    active = await client.get("/categories/export", params={"active_only": True}, headers=admin_headers)
+    assert [orjson.loads(line)["id"] for line in active.content.splitlines()] == ids[:1]
+
+
+async def test_export_categories_requires_admin(client, database):
+    response = await client.get("/categories/export")
+    
+    assert response.status_code == 403
+
+
+async def test_update_category_keeps_fields_it_did_not_set(client, admin_headers, database):
+    [category_id] = await _create_categories(client, admin_headers, ["Alpha"])
+    # Simulate a concurrent writer changing a field this update does not touch
+    from bson import ObjectId
+    await database["categories"].update_one(
+        {"_id": ObjectId(category_id)}, {"$set": {"description": "Written elsewhere"}}
+    )
+    
+    response = await client.put(f"/categories/{category_id}", json={"name": "Alpha Prime"}, headers=admin_headers)
+    assert response.status_code == 200
+    
+    category = (await client.get(f"/categories/{category_id}")).json()["data"]
+    assert category["name"] == "Alpha Prime"
+    assert category["description"] == "Written elsewhere"
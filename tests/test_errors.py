@@ -0,0 +1,34 @@
+import pytest
+
+from app.crud.product import product_crud
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_value_error_maps_to_400(client, admin_headers, monkeypatch):
+    async def fail(ids):
+        raise ValueError("Invalid product ID")
+    monkeypatch.setattr(product_crud, "lock_products_bulk", fail)
+    
+    response = await client.patch("/products/bulk/lock", json={"ids": ["x"]}, headers=admin_headers)
+    
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid product ID"}
+
+
+async def test_unexpected_error_maps_to_500(client, admin_headers, monkeypatch):
+    async def fail(ids):
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(product_crud, "lock_products_bulk", fail)
+    
+    response = await client.patch("/products/bulk/lock", json={"ids": ["x"]}, headers=admin_headers)
+    
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error occurred"}
+
+
+async def test_invalid_bulk_ids_return_400(client, admin_headers):
+    response = await client.patch("/products/bulk/lock", json={"ids": ["not-an-id"]}, headers=admin_headers)
+    
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid product ID(s): not-an-id"}
@@ -0,0 +1,165 @@
+import orjson
+import pytest
+from bson import ObjectId
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_bulk_create_products(client, admin_headers, category_id):
+    payload = [
+        {"title": "Dragon", "price": 12.5, "category_id": category_id},
+        {"title": "Castle", "price": 30.0, "category_id": category_id, "rating": 4.5},
+    ]
+    response = await client.post("/products/bulk", json=payload, headers=admin_headers)
+    
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert data["created"] == 2
+    assert len(data["ids"]) == 2
+    
+    listing = (await client.get("/products/")).json()
+    assert listing["total"] == 2
+    assert {p["category_name"] for p in listing["data"]} == {"Magnets"}
+
+
+async def test_bulk_create_rejects_unknown_category(client, admin_headers):
+    payload = [{"title": "Orphan", "price": 5.0, "category_id": str(ObjectId())}]
+    response = await client.post("/products/bulk", json=payload, headers=admin_headers)
+    
+    assert response.status_code == 400
+    assert (await client.get("/products/")).json()["total"] == 0
+
+
+async def test_bulk_create_requires_admin(client, category_id):
+    payload = [{"title": "Dragon", "price": 12.5, "category_id": category_id}]
+    response = await client.post("/products/bulk", json=payload)
+    
+    assert response.status_code == 403
+
+
+async def test_bulk_lock_and_unlock(client, admin_headers, make_products):
+    ids = await make_products(3)
+    
+    response = await client.patch("/products/bulk/lock", json={"ids": ids[:2]}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["data"] == {"matched": 2, "is_locked": True}
+    
+    unlocked = (await client.get("/products/unlocked")).json()
+    assert [p["id"] for p in unlocked["data"]] == [ids[2]]
+    
+    response = await client.patch("/products/bulk/unlock", json={"ids": ids}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["data"] == {"matched": 3, "is_locked": False}
+    assert (await client.get("/products/unlocked")).json()["total"] == 3
+
+
+async def test_locked_product_cannot_be_updated_or_deleted(client, admin_headers, make_products):
+    [product_id] = await make_products(1)
+    await client.patch(f"/products/{product_id}/lock", headers=admin_headers)
+    
+    response = await client.put(f"/products/{product_id}", data={"title": "Renamed"}, headers=admin_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot update locked product"
+    
+    response = await client.delete(f"/products/{product_id}", headers=admin_headers)
+    assert response.status_code == 400
+    
+    product = (await client.get(f"/products/{product_id}")).json()["data"]
+    assert product["title"] == "Product 0"
+
+
+async def test_update_missing_product_returns_404(client, admin_headers, database):
+    response = await client.put(f"/products/{ObjectId()}", data={"title": "Ghost"}, headers=admin_headers)
+    
+    assert response.status_code == 404
+
+
+async def test_export_products_streams_ndjson(client, admin_headers, category_id, make_products):
+    ids = await make_products(3)
+    
+    response = await client.get("/products/export", headers=admin_headers)
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert sorted(row["id"] for row in rows) == sorted(ids)
+    assert all(row["category_id"] == category_id for row in rows)
+
+
+async def test_get_product_revalidates_with_etag(client, admin_headers, make_products):
+    [product_id] = await make_products(1)
+    
+    first = await client.get(f"/products/{product_id}")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    
+    not_modified = await client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    
+    await client.put(f"/products/{product_id}", data={"title": "Renamed"}, headers=admin_headers)
+    changed = await client.get(f"/products/{product_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["data"]["title"] == "Renamed"
+
+
+async def test_list_products_revalidates_with_etag(client, make_products):
+    await make_products(2)
+    
+    etag = (await client.get("/products/")).headers["etag"]
+    response = await client.get("/products/", headers={"If-None-Match": f'"other", {etag}'})
+    
+    assert response.status_code == 304
+
+
+async def test_oversized_body_is_rejected(client, admin_headers):
+    from app.config import settings
+    body = b"[" + b" " * settings.max_request_body_size + b"]"
+    
+    response = await client.post("/products/bulk", content=body, headers={
+        **admin_headers, "Content-Type": "application/json"
+    })
+    
+    assert response.status_code == 413
+    assert response.json()["detail"] == f"Request body exceeds {settings.max_request_body_size} bytes"
+
+
+async def test_rejected_category_filter_cancels_the_page(client, monkeypatch, database):
+    import asyncio
+    from app.crud.product import product_crud
+    completed = []
+    
+    async def list_with_category(**kwargs):
+        await asyncio.sleep(0.05)
+        completed.append(kwargs)
+        return [], 0
+    monkeypatch.setattr(product_crud, "list_with_category", list_with_category)
+    
+    for path in ("/products/", "/products/unlocked"):
+        for category_id in ("not-an-id", str(ObjectId())):
+            response = await client.get(path, params={"category_id": category_id})
+            assert response.status_code == 400
+    
+    await asyncio.sleep(0.1)
+    assert completed == []
+
+
+async def test_listing_and_export_are_newest_first(client, admin_headers, category_id):
+    from datetime import datetime, timedelta
+    from app.models import Category, Product
+    category = await Category.get(ObjectId(category_id))
+    now = datetime.utcnow().replace(microsecond=0)
+    # Insert out of creation order so insertion order cannot pass for sorting
+    for title, age in (("Middle", 2), ("Newest", 1), ("Oldest", 3)):
+        await Product(title=title, price=5.0, category_id=category, created_at=now - timedelta(days=age)).insert()
+    
+    listing = (await client.get("/products/", params={"limit": 2})).json()
+    assert [p["title"] for p in listing["data"]] == ["Newest", "Middle"]
+    next_page = (await client.get("/products/", params={"skip": 2, "limit": 2})).json()
+    assert [p["title"] for p in next_page["data"]] == ["Oldest"]
+    
+    export = await client.get("/products/export", headers=admin_headers)
+    assert [orjson.loads(line)["title"] for line in export.content.splitlines()] == ["Newest", "Middle", "Oldest"]